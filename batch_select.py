@@ -0,0 +1,121 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import exact_solver
+import ga_engine
+import stats_store
+import team_selector
+import ts
+import ts1
+import ts2
+
+STRATEGIES = ('team_selector', 'ts2', 'greedy', 'random', 'exact')
+
+
+# Load the per-venue batter and bowler tables once, in the selector schema (Player, Venue, Country, ...)
+def load_venue_stats(batter_file=stats_store.BATTER_FILE, bowler_file=stats_store.BOWLER_FILE,
+                     players_file=stats_store.PLAYERS_FILE):
+    store = stats_store.get_store(batter_file, bowler_file, players_file)
+    return store.batters, store.bowlers
+
+
+# Read a schedule CSV with team, squad (comma-separated names) and venue columns; empty cells read as ''/[]
+def read_schedule(schedule_file):
+    schedule = pd.read_csv(schedule_file, dtype=str)
+    missing = {'team', 'squad', 'venue'} - set(schedule.columns)
+    if missing:
+        raise ValueError(f"Schedule is missing columns: {sorted(missing)}")
+    schedule[['team', 'squad', 'venue']] = schedule[['team', 'squad', 'venue']].fillna('')
+    schedule['venue'] = schedule['venue'].str.strip()
+    schedule['squad'] = schedule['squad'].map(lambda squad: [p.strip() for p in squad.split(',') if p.strip()])
+    return schedule
+
+
+# Pick an XII from one venue slice with the given strategy; returns a list of names
+def select_xii(venue_batters, venue_bowlers, squad, venue, strategy='team_selector', seed=42):
+    if strategy == 'greedy':
+        batters, bowlers = ts.filter_players(venue_batters, venue_bowlers, squad, venue)
+        return ts.generate_team(batters, bowlers)
+    if strategy == 'random':
+        # A seeded draw over the distinct squad players, repaired like a GA's initial team (no repeats, foreign limit)
+        batters, bowlers = ts1.filter_players(venue_batters, venue_bowlers, squad, venue)
+        index = ga_engine.encode_squad(batters, bowlers)
+        if not index.is_feasible():
+            return []
+        return index.team_names(ga_engine.random_population(index, 1, np.random.default_rng(seed))[0])
+    if strategy == 'ts2':
+        players = ts2.filter_by_squad_and_venue(venue_batters, venue_bowlers, squad, venue)
+        return [player['Player'] for player in ts2.genetic_algorithm(players, seed=seed)]
+    if strategy == 'exact':
+        batters, bowlers = team_selector.filter_players(venue_batters, venue_bowlers, squad, venue)
+        return exact_solver.select_xii(batters, bowlers)
+    if strategy == 'team_selector':
+        batters, bowlers = team_selector.filter_players(venue_batters, venue_bowlers, squad, venue)
+        return team_selector.genetic_algorithm(batters, bowlers, seed=seed)
+    raise ValueError(f"Unknown strategy '{strategy}'. Expected one of {STRATEGIES}")
+
+
+# Summed player score of a selected XII at the venue (NaN for an empty selection)
+def team_fitness(venue_batters, venue_bowlers, squad, venue, team):
+    if not team:
+        return np.nan
+    index = ga_engine.encode_squad(stats_store.select(venue_batters, squad, venue),
+                                   stats_store.select(venue_bowlers, squad, venue))
+    ids = {name: i for i, name in enumerate(index.names)}
+    return index.score[[ids[name] for name in team]].sum()
+
+
+def select_schedule(schedule, batter_stats, bowler_stats, strategy='team_selector', seed=42):
+    """Select an XII for every fixture, slicing each venue's rows out of the full tables only once.
+
+    Fixtures are grouped by venue key, so alias spellings of a ground share
+    one slice. Returns a DataFrame with team, venue (as written in the
+    schedule), player_1..player_12 and fitness (the team's summed player
+    score at that venue; NaN if no XII was found, e.g. for an empty squad).
+    """
+    rows = {}
+    venue_keys = schedule['venue'].map({venue: stats_store.venue_key(venue) for venue in schedule['venue'].unique()})
+    for _, fixtures in schedule.groupby(venue_keys, sort=False):
+        venue_batters = stats_store.venue_rows(batter_stats, fixtures['venue'].iloc[0])
+        venue_bowlers = stats_store.venue_rows(bowler_stats, fixtures['venue'].iloc[0])
+
+        for fixture_id, fixture in fixtures.iterrows():
+            squad, venue = fixture['squad'], fixture['venue']
+            team = select_xii(venue_batters, venue_bowlers, squad, venue, strategy, seed)
+            fitness = team_fitness(venue_batters, venue_bowlers, squad, venue, team)
+
+            row = {'team': fixture['team'], 'venue': venue}
+            row.update({f'player_{i}': name for i, name in enumerate(team, 1)})
+            row['fitness'] = fitness
+            rows[fixture_id] = row
+
+    columns = ['team', 'venue'] + [f'player_{i}' for i in range(1, ga_engine.TEAM_SIZE + 1)] + ['fitness']
+    return pd.DataFrame([rows[i] for i in schedule.index], columns=columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Select a playing XII for every fixture in a schedule.")
+    parser.add_argument('schedule', help="CSV with team, squad (comma-separated names) and venue columns")
+    parser.add_argument('-o', '--output', default='selected_teams.csv', help="Output CSV for all selected XIIs")
+    parser.add_argument('--strategy', choices=STRATEGIES, default='team_selector')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batter-file', default=stats_store.BATTER_FILE)
+    parser.add_argument('--bowler-file', default=stats_store.BOWLER_FILE)
+    parser.add_argument('--players-file', default=stats_store.PLAYERS_FILE)
+    args = parser.parse_args()
+
+    batter_stats, bowler_stats = load_venue_stats(args.batter_file, args.bowler_file, args.players_file)
+    schedule = read_schedule(args.schedule)
+    results = select_schedule(schedule, batter_stats, bowler_stats, args.strategy, args.seed)
+    results.to_csv(args.output, index=False)
+
+    selected = results['fitness'].notna().sum()
+    print(f"Selected {selected} of {len(results)} fixtures. Saved to {args.output}")
+    empty = schedule.index[schedule['squad'].map(len) == 0]
+    if len(empty):
+        print(f"Skipped {len(empty)} fixtures with an empty squad (rows {', '.join(str(i + 1) for i in empty)})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+RESULTS_FILE = 'benchmark_results.json'
+BASELINE_FILE = 'benchmark_baseline.json'
+
+# Today's dataset sizes, the 1x reference for the synthetic tables
+BASE_PLAYERS = 300
+BASE_VENUES = 19
+BASE_VENUES_PER_PLAYER = 5.5
+SQUAD_SIZE = 25
+
+PERFORMANCE_LABELS = ['Average', 'Bad', 'Excellent', 'Good', 'Poor']
+COUNTRIES = ['India'] * 6 + ['Australia', 'England', 'South Africa', 'New Zealand', 'West Indies']
+
+
+def synthetic_tables(scale, seed=0):
+    """Synthetic batter/bowler venue tables (selector schema) and venue stats (training schema) at `scale` x today."""
+    rng = np.random.default_rng(seed)
+    n_players = BASE_PLAYERS * scale
+    players = np.array([f'Player {i}' for i in range(n_players)])
+    venues = np.array([f'Venue {i}, City' for i in range(BASE_VENUES)])
+    country = rng.choice(COUNTRIES, n_players)
+
+    per_player = rng.poisson(BASE_VENUES_PER_PLAYER, n_players).clip(1, BASE_VENUES)
+    player_ids = np.repeat(np.arange(n_players), per_player)
+    venue_ids = np.concatenate([rng.choice(BASE_VENUES, k, replace=False) for k in per_player])
+    n = len(player_ids)
+
+    matches = rng.integers(1, 20, n)
+    runs = (matches * rng.gamma(2, 10, n)).astype(int)
+    balls = (matches * rng.integers(0, 24, n))
+    wickets = (balls / rng.uniform(12, 40, n)).astype(int)
+    conceded = (balls * rng.uniform(0.9, 1.8, n)).astype(int)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        economy = np.where(balls > 0, 6 * conceded / balls, np.nan)
+        strike = np.where(wickets > 0, balls / wickets, np.nan)
+    performance_bat = rng.choice(PERFORMANCE_LABELS, n)
+    performance_bowl = np.where(balls > 0, rng.choice(PERFORMANCE_LABELS, n), None)
+
+    common = {'Player': players[player_ids], 'Venue': venues[venue_ids], 'Country': country[player_ids]}
+    batters = pd.DataFrame({**common, 'total_runs': runs, 'matches_played': matches,
+                            'batting_average': runs / matches, 'Performance': performance_bat})
+    bowled = balls > 0
+    bowlers = pd.DataFrame({**common, 'matches_played': matches, 'total_runs_conceded': conceded,
+                            'balls_bowled': balls, 'economy': economy, 'total_wickets': wickets,
+                            'Bowling_Strike_Rate': strike, 'Performance': performance_bowl})[bowled]
+    venue_stats = pd.DataFrame({
+        'p_id': player_ids, 'Player_bat': common['Player'], 'Country_bat': common['Country'],
+        'Venue': common['Venue'], 'matches_played_bat': matches, 'total_runs': runs,
+        'batting_average': runs / matches, 'Performance_bat': performance_bat,
+        'matches_played_bowl': np.where(bowled, matches, 0), 'total_runs_conceded': conceded,
+        'balls_bowled': balls, 'economy': economy, 'total_wickets': wickets,
+        'Bowling_Strike_Rate': strike, 'Performance_bowl': performance_bowl,
+    })
+    return batters, bowlers.reset_index(drop=True), venue_stats
+
+
+def synthetic_squad(batters, bowlers, seed=0):
+    """A SQUAD_SIZE squad with stats at the busiest venue, mixing batters and bowlers."""
+    rng = np.random.default_rng(seed)
+    venue = batters['Venue'].value_counts().index[0]
+    batting = batters.loc[batters['Venue'] == venue, 'Player'].unique()
+    bowling = bowlers.loc[bowlers['Venue'] == venue, 'Player'].unique()
+    squad = list(rng.choice(bowling, min(10, len(bowling)), replace=False))
+    squad += [p for p in rng.permutation(batting) if p not in squad][:SQUAD_SIZE - len(squad)]
+    return squad, venue
+
+
+def _selector_tables(scale):
+    import stats_store
+    batters, bowlers, _ = synthetic_tables(scale)
+    squad, venue = synthetic_squad(batters, bowlers)
+    batters = stats_store.index_table(batters, 'Venue', 'Player')
+    bowlers = stats_store.index_table(bowlers, 'Venue', 'Player')
+    # Build the shared venue alias index outside the timed loops
+    stats_store.venue_rows(batters, venue)
+    return batters, bowlers, squad, venue
+
+
+def bench_load_csv(scale, repeat):
+    import data_cache
+    _, _, venue_stats = synthetic_tables(scale)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'venue_stats.csv')
+        venue_stats.to_csv(path, index=False)
+        cache_dir = os.path.join(tmp, 'cache')
+        data_cache.read_csv(path, cache_dir=cache_dir)
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            pd.read_csv(path)
+        csv_seconds = (time.perf_counter() - started) / repeat
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            data_cache.read_csv(path, cache_dir=cache_dir)
+        cached_seconds = (time.perf_counter() - started) / repeat
+    return {'wall_seconds': cached_seconds, 'csv_seconds': csv_seconds, 'rows': len(venue_stats)}
+
+
+def bench_generate_team(module_name, scale, repeat):
+    module = __import__(module_name)
+    batters, bowlers, squad, venue = _selector_tables(scale)
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        team = module.generate_team(*module.filter_players(batters, bowlers, squad, venue))
+    wall = (time.perf_counter() - started) / repeat
+    return {'wall_seconds': wall, 'teams_per_sec': 1 / wall, 'valid': len(team) == 12}
+
+
+def bench_team_selector(scale, repeat, generations=50, population_size=200):
+    import team_selector
+    batters, bowlers, squad, venue = _selector_tables(scale)
+    batters, bowlers = team_selector.filter_players(batters, bowlers, squad, venue)
+
+    started = time.perf_counter()
+    for seed in range(repeat):
+        team_selector.genetic_algorithm(batters, bowlers, generations, population_size, seed=seed)
+    wall = (time.perf_counter() - started) / repeat
+    return {'wall_seconds': wall, 'generations_per_sec': generations / wall,
+            'teams_per_sec': generations * population_size / wall}
+
+
+def bench_ts2(scale, repeat, generations=50, population_size=200):
+    import ts2
+    batters, bowlers, squad, venue = _selector_tables(scale)
+    players = ts2.filter_by_squad_and_venue(batters, bowlers, squad, venue)
+
+    started = time.perf_counter()
+    for seed in range(repeat):
+        ts2.genetic_algorithm(players, generations, population_size, seed=seed)
+    wall = (time.perf_counter() - started) / repeat
+    return {'wall_seconds': wall, 'generations_per_sec': generations / wall,
+            'teams_per_sec': generations * population_size / wall}
+
+
+def bench_model_fit(scale, repeat):
+    import performance_model
+    _, _, venue_stats = synthetic_tables(scale)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        performance_model.train(venue_stats)
+    return {'wall_seconds': (time.perf_counter() - started) / repeat, 'rows': len(venue_stats)}
+
+
+def bench_model_predict(scale, repeat):
+    import performance_model
+    _, _, venue_stats = synthetic_tables(scale)
+    artifact, *_ = performance_model.train(venue_stats)
+    batch = venue_stats.sample(SQUAD_SIZE, random_state=0)
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        artifact['model'].predict(performance_model.encode(batch, artifact['layout']))
+    wall = (time.perf_counter() - started) / repeat
+    return {'wall_seconds': wall, 'predictions_per_sec': SQUAD_SIZE / wall}
+
+
+BENCHMARKS = {
+    'load_csv': bench_load_csv,
+    'ts.generate_team': lambda scale, repeat: bench_generate_team('ts', scale, repeat),
+    'ts1.generate_team': lambda scale, repeat: bench_generate_team('ts1', scale, repeat),
+    'ts2.genetic_algorithm': bench_ts2,
+    'team_selector.genetic_algorithm': bench_team_selector,
+    'train1.fit': bench_model_fit,
+    'train1.predict': bench_model_predict,
+}
+
+
+# Runs in a fresh process so peak RSS belongs to this benchmark alone
+def _run_case(name, scale, repeat):
+    result = BENCHMARKS[name](scale, repeat)
+    try:
+        import resource
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        result['peak_rss_mb'] = maxrss / 2 ** 20 if sys.platform == 'darwin' else maxrss / 2 ** 10
+    except ImportError:
+        result['peak_rss_mb'] = None
+    return {'name': name, 'scale': scale, 'repeat': repeat, **result}
+
+
+def run(names, scales, repeat):
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for name in names:
+        for scale in scales:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(_run_case, name, scale, repeat).result()
+            results.append(result)
+            print(f"{name:34s} {scale:>4}x  {result['wall_seconds'] * 1000:10.2f} ms")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Results whose wall time exceeds the baseline's by more than `tolerance` (a fraction).
+
+    Cases the baseline has no entry for are listed with slowdown None.
+    """
+    reference = {(row['name'], row['scale']): row for row in baseline}
+    regressions = []
+    for row in results:
+        base = reference.get((row['name'], row['scale']))
+        if base is None:
+            regressions.append({'name': row['name'], 'scale': row['scale'], 'baseline_seconds': None,
+                                'wall_seconds': row['wall_seconds'], 'slowdown': None})
+        elif row['wall_seconds'] > base['wall_seconds'] * (1 + tolerance):
+            regressions.append({'name': row['name'], 'scale': row['scale'],
+                                'baseline_seconds': base['wall_seconds'], 'wall_seconds': row['wall_seconds'],
+                                'slowdown': row['wall_seconds'] / base['wall_seconds']})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark selectors, loaders and the performance model.")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument('--scales', nargs='+', type=int, default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('-o', '--output', default=RESULTS_FILE)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown before flagging (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    # Fail before spending minutes on the runs when there is nothing to compare against
+    if not args.save_baseline and not os.path.exists(args.baseline):
+        sys.exit(f"Baseline {args.baseline} not found; record one with --save-baseline")
+
+    results = run(args.only, args.scales, args.repeat)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    else:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for row in regressions:
+            if row['slowdown'] is None:
+                print(f"MISSING {row['name']} {row['scale']}x: no baseline entry")
+            else:
+                print(f"REGRESSION {row['name']} {row['scale']}x: {row['slowdown']:.2f}x slower than baseline")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = '.data_cache'
+NA_VALUES = ['N/A', 'NA', '']
+FORMAT_VERSION = 1
+
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_path(source, cache_dir):
+    name = os.path.splitext(os.path.basename(source))[0]
+    key = hashlib.sha1(os.path.abspath(source).encode()).hexdigest()[:10]
+    return os.path.join(cache_dir, f"{name.replace(' ', '_')}-{key}")
+
+
+def _is_fresh(meta, source):
+    """Source unchanged since the cache was written: same size and mtime, or same content hash."""
+    if meta.get('version') != FORMAT_VERSION:
+        return False
+    stat = os.stat(source)
+    if meta['size'] != stat.st_size:
+        return False
+    if meta['mtime_ns'] == stat.st_mtime_ns:
+        return True
+    return meta['sha1'] == file_hash(source)
+
+
+def _write_cache(df, source, path):
+    os.makedirs(path, exist_ok=True)
+    columns = []
+    for i, name in enumerate(df.columns):
+        values = df[name]
+        column = {'name': name, 'file': f'col_{i:03d}.npy'}
+        if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+            data = values.to_numpy()
+        elif values.dropna().map(type).eq(bool).all():
+            # True/False with gaps: keep it numeric (1.0/0.0) with NaN for the gaps
+            data = values.astype(float).to_numpy()
+        else:
+            # Text columns (venue, player, performance, ...) are stored as categorical codes
+            categorical = pd.Categorical(values.astype(object).where(values.notna(), None))
+            column['categories'] = [str(c) for c in categorical.categories]
+            data = categorical.codes.astype(np.int32)
+        np.save(os.path.join(path, column['file']), data)
+        columns.append(column)
+
+    stat = os.stat(source)
+    meta = {
+        'version': FORMAT_VERSION,
+        'source': os.path.abspath(source),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha1': file_hash(source),
+        'rows': len(df),
+        'columns': columns,
+    }
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+    return meta
+
+
+def _read_cache(path, meta):
+    data = {}
+    for column in meta['columns']:
+        values = np.load(os.path.join(path, column['file']), mmap_mode='r')
+        if 'categories' in column:
+            values = pd.Categorical.from_codes(values, categories=column['categories'])
+        data[column['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def read_csv(source, cache_dir=CACHE_DIR, refresh=False):
+    """Load a dataset CSV through a typed columnar binary cache.
+
+    The first load parses the CSV ('N/A'/'NA' become NaN floats) and writes
+    one .npy file per column, text columns as categorical codes. Later loads
+    memory-map those files. The cache is rebuilt when the source's size,
+    mtime and content hash no longer match.
+    """
+    path = _cache_path(source, cache_dir)
+    meta_file = os.path.join(path, 'meta.json')
+
+    if not refresh and os.path.exists(meta_file):
+        with open(meta_file) as f:
+            meta = json.load(f)
+        if _is_fresh(meta, source):
+            if meta['mtime_ns'] != os.stat(source).st_mtime_ns:
+                # Touched but unchanged: record the new mtime so the hash is not recomputed next time
+                meta['mtime_ns'] = os.stat(source).st_mtime_ns
+                with open(meta_file, 'w') as f:
+                    json.dump(meta, f)
+            return _read_cache(path, meta)
+
+    df = pd.read_csv(source, na_values=NA_VALUES, keep_default_na=True)
+    meta = _write_cache(df, source, path)
+    return _read_cache(path, meta)
@@ -0,0 +1,221 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+import data_cache
+
+# Declared column types: text is stored categorical; a flag is True/False (or 1/0) read as 1.0/0.0
+TEXT = 'category'
+INT = 'int64'
+FLOAT = 'float64'
+FLAG = 'flag'
+
+PERFORMANCE_LABELS = ['Excellent', 'Good', 'Average', 'Poor', 'Bad']
+MATCHUP_LABELS = ['Excellent', 'Very Good', 'Good', 'Average', 'Poor', 'No Average']
+FLAG_VALUES = {'true': 1.0, 'false': 0.0, '1': 1.0, '0': 0.0, '1.0': 1.0, '0.0': 0.0}
+
+# Checks that make a frame unusable (raise in strict mode); the rest are reported as warnings
+ERRORS = {'missing_column', 'unparseable', 'null_key'}
+
+# Distinct offending values listed per report row
+EXAMPLES = 3
+
+
+class SchemaError(ValueError):
+    def __init__(self, report):
+        super().__init__(format_report(report))
+        self.report = report
+
+
+class Schema:
+    """Declared columns (name -> type), key columns, NA sentinels and allowed labels of one dataset."""
+
+    def __init__(self, columns, key, na_values=(), labels=None):
+        self.columns = columns
+        self.key = key
+        self.na_values = {value.lower() for value in ('', 'nan', *na_values)}
+        self.labels = labels or {}
+
+
+_BOWLING_TYPES = ['Left Fast', 'Left Leg Spin', 'Left Mid Fast', 'Left Off Spin', 'Right  Mid Fast', 'Right Fast',
+                  'Right Leg Spin', 'Right Mid Fast', 'Right Off Spin']
+
+SCHEMAS = {
+    'updated_batter_stats.csv': Schema(
+        {'batter': TEXT, 'venue': TEXT, 'total_runs': INT, 'matches_played': INT, 'batting_average': FLOAT,
+         'Performance': TEXT},
+        key=['batter', 'venue'], na_values=['NA'], labels={'Performance': PERFORMANCE_LABELS}),
+    'final_bowler_stats_with_NA.csv': Schema(
+        {'bowler': TEXT, 'venue': TEXT, 'matches_played': INT, 'total_runs_conceded': INT, 'balls_bowled': INT,
+         'economy': FLOAT, 'total_wickets': INT, 'Bowling_Strike_Rate': FLOAT, 'Performance': TEXT},
+        key=['bowler', 'venue'], na_values=['NA'], labels={'Performance': PERFORMANCE_LABELS}),
+    'cleaned_player_stats_in_venues_filled.csv': Schema(
+        {'p_id': INT, 'Player_bat': TEXT, 'Country_bat': TEXT, 'Venue': TEXT, 'matches_played_bat': INT,
+         'total_runs': INT, 'batting_average': FLOAT, 'Performance_bat': TEXT, 'matches_played_bowl': INT,
+         'total_runs_conceded': INT, 'balls_bowled': INT, 'economy': FLOAT, 'total_wickets': INT,
+         'Bowling_Strike_Rate': FLOAT, 'Performance_bowl': TEXT},
+        key=['Player_bat', 'Venue'], na_values=['N/A'],
+        labels={'Performance_bat': PERFORMANCE_LABELS, 'Performance_bowl': PERFORMANCE_LABELS}),
+    'final_cricket_stats_fixed.csv': Schema(
+        {'Player': TEXT, 'Runs': FLOAT, 'Balls_Faced': FLOAT, 'Fours': FLOAT, 'Sixes': FLOAT, 'Not_Outs': FLAG,
+         'Dismissals': FLOAT, 'Batting_Average': FLOAT, 'Strike_Rate': FLOAT, 'Wickets': FLOAT,
+         'Overs_Bowled': FLOAT, 'Runs_Conceded': FLOAT, 'Economy': FLOAT, 'Bowling_Strike_Rate': FLOAT,
+         'Bowling_Average': FLOAT, 'Catches': FLOAT, 'Stumpings': FLOAT, 'Run_Outs': FLOAT, 'Matches_Played': INT},
+        key=['Player'], na_values=['NA']),
+    'batter_bowler_analysis.csv': Schema(
+        {'batter': TEXT, 'bowler': TEXT, 'total_runs_against_bowler': INT, 'balls_faced': INT, 'strike_rate': FLOAT,
+         'total_dismissals': INT, 'bowled': INT, 'caught': INT, 'caught and bowled': INT, 'lbw': INT, 'stumped': INT,
+         'performance': TEXT, 'bowling_type': TEXT},
+        key=['batter', 'bowler'], labels={'performance': MATCHUP_LABELS, 'bowling_type': _BOWLING_TYPES}),
+    'batter dismissed against perticular bowler type.csv': Schema(
+        {'batter': TEXT, **{bowling_type: INT for bowling_type in _BOWLING_TYPES}},
+        key=['batter']),
+    'player_venue_predicted_performance.csv': Schema(
+        {'Player': TEXT, 'Venue': TEXT, 'Predicted Performance': TEXT},
+        key=['Player', 'Venue'], labels={'Predicted Performance': PERFORMANCE_LABELS}),
+    'player_venue_joint_predictions.csv': Schema(
+        {'Player': TEXT, 'Venue': TEXT, 'Predicted Batting Performance': TEXT, 'Predicted Bowling Performance': TEXT},
+        key=['Player', 'Venue'], labels={'Predicted Batting Performance': PERFORMANCE_LABELS,
+                                         'Predicted Bowling Performance': PERFORMANCE_LABELS}),
+}
+
+
+def _issue(report, column, check, mask, values):
+    rows = int(mask.sum())
+    if rows:
+        examples = pd.unique(np.asarray(values)[np.asarray(mask)].astype(str))[:EXAMPLES]
+        report.append({'column': column, 'check': check, 'rows': rows, 'examples': ', '.join(examples)})
+
+
+# Categorical text with surrounding whitespace stripped and NA sentinels removed, by remapping category codes
+def _clean_text(values, na_values):
+    values = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype(object).astype(TEXT)
+    categories = values.cat.categories.astype(str).str.strip()
+    keep = ~categories.str.lower().isin(na_values)
+    cleaned = pd.Index(pd.unique(categories[keep]))
+    # Index -1 (already missing) stays -1
+    remap = np.append(np.where(keep, cleaned.get_indexer(categories), -1), -1)
+    codes = remap[values.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, cleaned), index=values.index)
+
+
+# (numbers, mask of values that were present but could not be parsed)
+def _clean_number(values, na_values, kind):
+    if kind == FLAG and (pd.api.types.is_bool_dtype(values) or values.dropna().map(type).eq(bool).all()):
+        values = values.astype(object).where(values.notna(), None)
+        return pd.to_numeric(values.map({True: 1.0, False: 0.0}), errors='coerce'), np.zeros(len(values), bool)
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.astype(FLOAT), np.zeros(len(values), bool)
+
+    text = values.astype(object).where(values.notna(), None).map(str, na_action='ignore').str.strip()
+    present = text.notna() & ~text.str.lower().isin(na_values)
+    if kind == FLAG:
+        numbers = text.str.lower().map(FLAG_VALUES)
+    else:
+        numbers = pd.to_numeric(text.where(present), errors='coerce')
+    return numbers.astype(FLOAT), (present & numbers.isna()).to_numpy()
+
+
+def clean(df, schema):
+    """Typed copy of `df` under `schema`, plus a report of every problem found (one row per column and check).
+
+    Column names are stripped; text becomes categorical with sentinels
+    (schema.na_values) as NaN; numbers and flags become float64, and int64
+    where a declared integer column has no gaps. Unparseable values become
+    NaN. Columns not in the schema pass through unchanged.
+    """
+    df = df.rename(columns=lambda name: str(name).strip())
+    report = []
+    columns = {}
+    for column, kind in schema.columns.items():
+        if column not in df.columns:
+            report.append({'column': column, 'check': 'missing_column', 'rows': len(df), 'examples': ''})
+            continue
+        values = df[column]
+        if kind == TEXT:
+            columns[column] = _clean_text(values, schema.na_values)
+            if column in schema.labels:
+                labels = columns[column]
+                _issue(report, column, 'unknown_label', labels.notna() & ~labels.isin(schema.labels[column]), labels)
+            continue
+
+        numbers, unparseable = _clean_number(values, schema.na_values, kind)
+        _issue(report, column, 'unparseable', unparseable, values)
+        if kind == INT:
+            whole = numbers.notna() & (numbers % 1 == 0)
+            _issue(report, column, 'not_integer', numbers.notna() & ~whole, numbers)
+            if whole.all():
+                numbers = numbers.astype(INT)
+            else:
+                _issue(report, column, 'missing_value', numbers.isna() & ~unparseable, values)
+        columns[column] = numbers
+    df = df.assign(**columns)
+
+    key = [column for column in schema.key if column in df.columns]
+    if key:
+        null_key = df[key].isna().any(axis=1)
+        _issue(report, '+'.join(key), 'null_key', null_key, df[key[0]])
+        labels = df[key[0]].astype(object).astype(str)
+        for column in key[1:]:
+            labels = labels + ' | ' + df[column].astype(object).astype(str)
+        duplicated = df.duplicated(key, keep=False) & ~null_key
+        _issue(report, '+'.join(key), 'duplicate_key', duplicated, labels)
+
+    report = pd.DataFrame(report, columns=['column', 'check', 'rows', 'examples'])
+    report.insert(2, 'severity', np.where(report['check'].isin(ERRORS), 'error', 'warning'))
+    return df, report
+
+
+def validate(path, schema=None):
+    """(clean frame, report) for a dataset file; the schema defaults to the one declared for its file name."""
+    df = data_cache.read_csv(path)
+    schema = schema or SCHEMAS.get(os.path.basename(path))
+    if schema is None:
+        return df, pd.DataFrame(columns=['column', 'check', 'severity', 'rows', 'examples'])
+    return clean(df, schema)
+
+
+def load(path, schema=None, strict=False):
+    """Clean typed frame of a dataset file.
+
+    Raises SchemaError when a declared column is missing (or, with
+    strict=True, on any error-level problem); row-level warnings are left
+    to validate() and the command line.
+    """
+    df, report = validate(path, schema)
+    errors = report[(report['check'] == 'missing_column') | (strict & (report['severity'] == 'error'))]
+    if len(errors):
+        raise SchemaError(errors.assign(dataset=os.path.basename(path)))
+    return df
+
+
+def format_report(report):
+    """One line per problem: dataset: column check (severity), row count and example values."""
+    lines = []
+    for row in report.itertuples(index=False):
+        dataset = f"{row.dataset}: " if 'dataset' in report.columns else ''
+        examples = f" e.g. {row.examples}" if row.examples else ''
+        lines.append(f"{dataset}{row.column} {row.check} ({row.severity}): {row.rows} rows{examples}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate the datasets against their declared schemas.")
+    parser.add_argument('files', nargs='*', help="Dataset files (default: every file with a declared schema)")
+    parser.add_argument('-o', '--output', help="Also write the report as CSV")
+    args = parser.parse_args()
+
+    files = args.files or [path for path in SCHEMAS if os.path.exists(path)]
+    reports = [validate(path)[1].assign(dataset=os.path.basename(path)) for path in files]
+    report = pd.concat(reports, ignore_index=True)
+    report = report[['dataset'] + [column for column in report.columns if column != 'dataset']]
+    if args.output:
+        report.to_csv(args.output, index=False)
+    print(format_report(report) if len(report) else f"{len(files)} datasets valid")
+    sys.exit(1 if (report['severity'] == 'error').any() else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import time
+
+import numpy as np
+
+import ga_engine
+
+
+class _Pool:
+    """Players of one kind (anyone, bat-capable or bowl-capable) in descending score order.
+
+    best(i, k, foreign_left) bounds the summed score of any k of them from
+    sorted position i on with at most foreign_left overseas players, or
+    returns None when k such players do not exist.
+    """
+
+    def __init__(self, eligible, score, foreign):
+        self.lists = {}
+        n = len(score)
+        for name, mask in (('all', eligible), ('domestic', eligible & ~foreign), ('foreign', eligible & foreign)):
+            positions = np.flatnonzero(mask)
+            # First list entry at or after each sorted position
+            start = np.searchsorted(positions, np.arange(n + 1)).tolist()
+            prefix = np.concatenate([[0.0], np.cumsum(score[positions])]).tolist()
+            overseas = np.concatenate([[0], np.cumsum(foreign[positions])]).tolist()
+            self.lists[name] = (start, prefix, overseas, len(positions))
+
+    def best(self, i, k, foreign_left):
+        if k == 0:
+            return 0.0
+        start, _, overseas, size = self.lists['all']
+        d_start, d_prefix, _, d_size = self.lists['domestic']
+        f_start, f_prefix, _, f_size = self.lists['foreign']
+        d, f = d_start[i], f_start[i]
+        lowest, highest = max(0, k - (d_size - d)), min(foreign_left, k, f_size - f)
+        if lowest > highest:
+            return None
+        # Score is concave in the overseas count t: clip the unconstrained best (the top k's count) to [lowest, highest]
+        s = start[i]
+        t = overseas[min(s + k, size)] - overseas[s]
+        t = min(max(t, lowest), highest)
+        return f_prefix[f + t] - f_prefix[f] + d_prefix[d + k - t] - d_prefix[d]
+
+
+def is_feasible(index, batters=7, bowlers=4, reserves=1, max_foreign=None):
+    """True when enough bat-capable, bowl-capable and domestic players exist for the slots."""
+    max_foreign = index.max_foreign if max_foreign is None else max_foreign
+    domestic = ~index.foreign
+    can_bat = (index.role & ga_engine.ROLE_BATTER) > 0
+    can_bowl = (index.role & ga_engine.ROLE_BOWLER) > 0
+    available = lambda mask: int((mask & domestic).sum()) + min(int((mask & ~domestic).sum()), max_foreign)
+    everyone = np.ones(len(index), dtype=bool)
+    return (available(can_bat) >= batters and available(can_bowl) >= bowlers
+            and available(can_bat | can_bowl) >= batters + bowlers
+            and available(everyone) >= batters + bowlers + reserves)
+
+
+def solve(index, batters=7, bowlers=4, reserves=1, max_foreign=None):
+    """Provably optimal team for the additive fitness by branch-and-bound.
+
+    Picks `batters` players who can bat, `bowlers` who can bowl and
+    `reserves` more of anyone (the 12th man), all distinct, with at most
+    `max_foreign` (default: the index's limit) overseas players, maximizing
+    the summed player score. Players are branched in descending score order.
+    A branch is pruned when its open slots cannot be filled, or when its
+    score plus a bound on them cannot beat the incumbent. The bound takes
+    each role's slots only from players who can fill them within the
+    remaining overseas quota.
+
+    Returns (team, fitness) with team as an ID array ordered batters,
+    bowlers, reserves; (None, None) when no valid team exists.
+    """
+    max_foreign = index.max_foreign if max_foreign is None else max_foreign
+    if not is_feasible(index, batters, bowlers, reserves, max_foreign):
+        return None, None
+
+    order = np.argsort(-index.score, kind='stable')
+    score = index.score[order].tolist()
+    foreign = index.foreign[order].tolist()
+    bat_mask = (index.role[order] & ga_engine.ROLE_BATTER) > 0
+    bowl_mask = (index.role[order] & ga_engine.ROLE_BOWLER) > 0
+    can_bat, can_bowl = bat_mask.tolist(), bowl_mask.tolist()
+    anyone = _Pool(np.ones(len(order), dtype=bool), index.score[order], index.foreign[order])
+    bat_pool = _Pool(bat_mask, index.score[order], index.foreign[order])
+    bowl_pool = _Pool(bowl_mask, index.score[order], index.foreign[order])
+    n = len(score)
+
+    def bound(i, open_bat, open_bowl, open_reserve, foreign_left):
+        # Each bound relaxes distinctness between its two parts, so the smallest is still an upper bound
+        best_any = anyone.best(i, open_bat + open_bowl + open_reserve, foreign_left)
+        bat = bat_pool.best(i, open_bat, foreign_left)
+        bowl = bowl_pool.best(i, open_bowl, foreign_left)
+        if best_any is None or bat is None or bowl is None:
+            return None
+        rest_bat = anyone.best(i, open_bowl + open_reserve, foreign_left)
+        rest_bowl = anyone.best(i, open_bat + open_reserve, foreign_left)
+        return min(best_any, bat + rest_bat, bowl + rest_bowl)
+
+    best = {'fitness': -np.inf, 'team': None}
+    picks = []  # (position, slot) pairs; slot 0 = batter, 1 = bowler, 2 = reserve
+
+    def search(i, open_bat, open_bowl, open_reserve, foreign_left, total):
+        if open_bat + open_bowl + open_reserve == 0:
+            if total > best['fitness']:
+                best['fitness'] = total
+                best['team'] = list(picks)
+            return
+        limit = bound(i, open_bat, open_bowl, open_reserve, foreign_left) if i < n else None
+        if limit is None or total + limit <= best['fitness']:
+            return
+
+        if not foreign[i] or foreign_left > 0:
+            left = foreign_left - foreign[i]
+            for slot, allowed, counts in (
+                (0, open_bat and can_bat[i], (open_bat - 1, open_bowl, open_reserve)),
+                (1, open_bowl and can_bowl[i], (open_bat, open_bowl - 1, open_reserve)),
+                (2, open_reserve, (open_bat, open_bowl, open_reserve - 1)),
+            ):
+                if allowed:
+                    picks.append((i, slot))
+                    search(i + 1, *counts, left, total + score[i])
+                    picks.pop()
+        search(i + 1, open_bat, open_bowl, open_reserve, foreign_left, total)
+
+    search(0, batters, bowlers, reserves, max_foreign, 0.0)
+    if best['team'] is None:
+        return None, None
+
+    team = sorted(best['team'], key=lambda pick: pick[1])
+    return np.array([order[position] for position, _ in team]), float(best['fitness'])
+
+
+def select_xii(batters, bowlers):
+    """Optimal XII (7 batters, 4 bowlers, 12th man, max 4 foreign) as names, or [] if impossible."""
+    index = ga_engine.encode_squad(batters, bowlers)
+    if not index.is_feasible() or not is_feasible(index):
+        return []
+    team, _ = solve(index)
+    return [index.names[i] for i in team] if team is not None else []
+
+
+def optimality_gap(index, team, **constraints):
+    """How far a team (IDs or names) falls short of the optimum under the given constraints.
+
+    Defaults to the GA's own constraints (any 12, foreign limit only).
+    Returns a dict with the team and optimal fitness, the relative gap
+    (0 means the team is optimal) and the solver time in milliseconds.
+    """
+    constraints = {'batters': 0, 'bowlers': 0, 'reserves': ga_engine.TEAM_SIZE, **constraints}
+    if len(team) and isinstance(team[0], str):
+        ids = {name: i for i, name in enumerate(index.names)}
+        team = [ids[name] for name in team]
+    fitness = float(index.score[np.asarray(team)].sum())
+
+    started = time.perf_counter()
+    _, optimum = solve(index, **constraints)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    gap = (optimum - fitness) / abs(optimum) if optimum else 0.0
+    return {'fitness': fitness, 'optimal_fitness': optimum, 'gap': gap, 'solve_ms': elapsed_ms}
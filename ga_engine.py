@@ -0,0 +1,284 @@
+from collections import OrderedDict
+
+import numpy as np
+
+import instrumentation
+import scoring
+
+TEAM_SIZE = 12
+MAX_FOREIGN = 4
+FITNESS_CACHE_SIZE = 50_000
+
+ROLE_BATTER = 1
+ROLE_BOWLER = 2
+
+
+class SquadIndex:
+    """A filtered squad encoded once as integer player IDs and parallel NumPy arrays."""
+
+    def __init__(self, names, foreign, role, score, max_foreign=MAX_FOREIGN):
+        self.names = list(names)
+        self.foreign = np.asarray(foreign, dtype=bool)
+        self.role = np.asarray(role, dtype=np.int8)
+        self.score = np.asarray(score, dtype=np.float64)
+        self.max_foreign = TEAM_SIZE if max_foreign is None else max_foreign
+
+    def __len__(self):
+        return len(self.names)
+
+    def is_feasible(self):
+        """True when a 12-man team within the foreign-player limit can be formed."""
+        domestic = int((~self.foreign).sum())
+        return domestic + min(int(self.foreign.sum()), self.max_foreign) >= TEAM_SIZE
+
+    def team_names(self, team):
+        """Decode a team of player IDs, batters first and bowlers after."""
+        team = np.asarray(team)
+        bowlers_only = self.role[team] == ROLE_BOWLER
+        ordered = np.concatenate([team[~bowlers_only], team[bowlers_only]])
+        return [self.names[i] for i in ordered]
+
+
+# Encode the filtered batters/bowlers frames (Player, Country, ...) into a SquadIndex
+def encode_squad(batters, bowlers):
+    names = []
+    ids = {}
+    foreign = []
+    role = []
+    score = []
+
+    for frame, role_bit in ((batters, ROLE_BATTER), (bowlers, ROLE_BOWLER)):
+        if frame is None or len(frame) == 0:
+            continue
+        row_scores = scoring.player_scores(frame)
+        for player, country, row_score in zip(frame['Player'], frame['Country'], row_scores):
+            idx = ids.get(player)
+            if idx is None:
+                idx = ids[player] = len(names)
+                names.append(player)
+                foreign.append(country != 'India')
+                role.append(0)
+                score.append(row_score)
+            role[idx] |= role_bit
+            score[idx] = max(score[idx], row_score)
+
+    return SquadIndex(names, foreign, role, score)
+
+
+# Encode a ts2 player table (or player dicts, one per player) into a SquadIndex without a foreign-player limit
+def index_from_records(players, max_foreign=None):
+    role = [ROLE_BATTER | ROLE_BOWLER] * len(players)
+    if isinstance(players, np.ndarray):
+        return SquadIndex(players['Player'], players['Country'] != 'India', role, players['score'], max_foreign)
+    foreign = [player.get('Country', 'India') != 'India' for player in players]
+    names = [player['Player'] for player in players]
+    return SquadIndex(names, foreign, role, scoring.player_scores(players), max_foreign)
+
+
+# Team fitness for a whole population of shape (P, 12), plus any extra fitness terms
+def population_fitness(population, index, terms=(), cache=None):
+    if cache is not None:
+        return cache.fitness(population, index, terms)
+    instrumentation.count('teams_evaluated', len(population))
+    fitness = scoring.team_fitness(population, index.score)
+    for term in terms:
+        fitness = fitness + term(population)
+    return fitness
+
+
+class FitnessCache:
+    """Bounded LRU memo of team fitness keyed by the team's player set.
+
+    A team's signature is the bitmask of its player IDs, so the same XII in
+    any order (an elite carried over, a child identical to its parent) is
+    evaluated once. Fitness terms must depend only on which players are in
+    the team, which holds for the summed scores and every term in this repo.
+    """
+
+    def __init__(self, maxsize=FITNESS_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def signatures(population, n_players):
+        """One hashable key per team: an int bitmask, or packed bytes for squads over 64 players."""
+        population = np.atleast_2d(population)
+        if n_players <= 64:
+            bits = np.left_shift(np.uint64(1), population.astype(np.uint64))
+            return np.bitwise_or.reduce(bits, axis=1).tolist()
+        mask = np.zeros((len(population), n_players), dtype=bool)
+        mask[np.arange(len(population))[:, None], population] = True
+        return [row.tobytes() for row in np.packbits(mask, axis=1)]
+
+    def fitness(self, population, index, terms=()):
+        keys = self.signatures(population, len(index))
+        fitness = np.empty(len(keys))
+        entries = self._entries
+        pending = {}
+        for row, key in enumerate(keys):
+            value = entries.get(key)
+            if value is None:
+                pending.setdefault(key, []).append(row)
+            else:
+                entries.move_to_end(key)
+                fitness[row] = value
+
+        # Repeats of a missing team within the batch are computed once and count as hits
+        self.hits += len(keys) - len(pending)
+        self.misses += len(pending)
+        instrumentation.count('fitness_cache_hits', len(keys) - len(pending))
+        instrumentation.count('fitness_cache_misses', len(pending))
+        if pending:
+            first_rows = [rows[0] for rows in pending.values()]
+            computed = population_fitness(population[first_rows], index, terms)
+            for (key, rows), value in zip(pending.items(), computed.tolist()):
+                fitness[rows] = value
+                entries[key] = value
+            while len(entries) > self.maxsize:
+                entries.popitem(last=False)
+        return fitness
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries),
+                'hit_rate': self.hits / lookups if lookups else 0.0}
+
+
+# Random permutation of all player IDs for every row, used as a fill-in tail during repair
+def _random_tails(rows, index, rng):
+    return np.argsort(rng.random((rows, len(index))), axis=1)
+
+
+def repair(candidates, index):
+    """Reduce each row of candidate IDs (in priority order) to a valid team.
+
+    Keeps the first occurrence of every player, drops foreign players beyond
+    the foreign-player limit and returns the first 12 survivors of each row. Every row must
+    contain enough valid candidates, which a full random tail guarantees.
+    """
+    order = np.argsort(candidates, axis=1, kind='stable')
+    sorted_ids = np.take_along_axis(candidates, order, axis=1)
+    repeated = np.zeros(candidates.shape, dtype=bool)
+    repeated[:, 1:] = sorted_ids[:, 1:] == sorted_ids[:, :-1]
+    duplicate = np.empty_like(repeated)
+    np.put_along_axis(duplicate, order, repeated, axis=1)
+
+    valid = ~duplicate
+    foreign = index.foreign[candidates] & valid
+    over_limit = foreign & (np.cumsum(foreign, axis=1) > index.max_foreign)
+    valid &= ~over_limit
+
+    picks = np.argsort(~valid, axis=1, kind='stable')[:, :TEAM_SIZE]
+
+    if instrumentation.enabled():
+        # Only drops up to each row's 12th kept candidate displaced a player; the random tail's repeats do not
+        considered = np.arange(candidates.shape[1]) <= picks[:, -1:]
+        instrumentation.count('repair_calls')
+        instrumentation.count('repair_rows', len(candidates))
+        instrumentation.count('duplicate_hits', int((duplicate & considered).sum()))
+        instrumentation.count('foreign_drops', int((over_limit & considered).sum()))
+
+    return np.take_along_axis(candidates, picks, axis=1)
+
+
+def random_population(index, size, rng):
+    return repair(_random_tails(size, index, rng), index)
+
+
+# One-point crossover (first 7 of parent1, rest of parent2) for all pairs at once
+def crossover(parents1, parents2, index, rng, split=7):
+    candidates = np.concatenate([
+        parents1[:, :split],
+        parents2[:, split:],
+        parents2[:, :split],
+        parents1[:, split:],
+        _random_tails(len(parents1), index, rng),
+    ], axis=1)
+    return repair(candidates, index)
+
+
+# Replace one random slot with a random player in a fraction of the population
+def mutate(population, index, rng, rate=0.2):
+    rows = np.flatnonzero(rng.random(len(population)) < rate)
+    if rows.size == 0:
+        return population
+    mutated = population[rows].copy()
+    slots = rng.integers(0, TEAM_SIZE, size=rows.size)
+    mutated[np.arange(rows.size), slots] = rng.integers(0, len(index), size=rows.size)
+    population = population.copy()
+    population[rows] = repair(np.concatenate([mutated, _random_tails(rows.size, index, rng)], axis=1), index)
+    return population
+
+
+def evolve_population(population, index, generations, rng, mutation_rate=0.2,
+                      selection='tournament', elite=2, tournament_size=3, patience=None, fitness_terms=(),
+                      fitness_cache=True):
+    """Evolve an existing (P, 12) population in place of a fresh one.
+
+    `selection` is 'tournament' (default) or 'truncation' (parents drawn from
+    the fittest half). The `elite` best teams always survive unchanged, and
+    with `patience` set the run stops once the best fitness plateaus.
+    Each of `fitness_terms` is a picklable callable mapping the (P, 12) ID
+    population to a (P,) array that is added to the summed player scores.
+    Returns (population, fitness, history) where history holds one
+    (best, mean) fitness pair per generation evaluated.
+    `fitness_cache` is a FitnessCache to share, True for a fresh one per
+    call or None to evaluate every team. The cache's stats() are recorded
+    in the trace at the end of the run (cumulative for a shared cache), so
+    any traced selector run shows its hit rate.
+    """
+    if fitness_cache is True:
+        fitness_cache = FitnessCache()
+    population_size = len(population)
+    fitness = population_fitness(population, index, fitness_terms, fitness_cache)
+    elite = min(elite, population_size)
+    stopper = scoring.PlateauStopper(patience)
+    history = []
+    run = instrumentation.new_run()
+
+    for number in range(generations):
+        history.append((float(fitness.max()), float(fitness.mean())))
+        instrumentation.generation(run, number, *history[-1])
+        if stopper.update(fitness.max()):
+            break
+
+        n_children = population_size - elite
+        with instrumentation.stage('selection'):
+            if selection == 'truncation':
+                parents = scoring.truncation_select(fitness, 2 * n_children, rng, max(2, population_size // 2))
+            else:
+                parents = scoring.tournament_select(fitness, 2 * n_children, rng, tournament_size)
+
+        with instrumentation.stage('crossover'):
+            children = crossover(population[parents[:n_children]], population[parents[n_children:]], index, rng)
+        with instrumentation.stage('mutation'):
+            children = mutate(children, index, rng, mutation_rate)
+        population = np.concatenate([population[scoring.elite_indices(fitness, elite)], children])
+        with instrumentation.stage('fitness'):
+            fitness = population_fitness(population, index, fitness_terms, fitness_cache)
+
+    if fitness_cache is not None:
+        instrumentation.fitness_cache(run, fitness_cache.stats())
+    return population, fitness, history
+
+
+def evolve(index, generations=50, population_size=20, rng=None, **options):
+    """Run the GA over the encoded squad and return the best team as an ID array, or None.
+
+    Keyword options are passed through to evolve_population.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if not index.is_feasible():
+        return None
+
+    with instrumentation.stage('initial_population'):
+        population = random_population(index, population_size, rng)
+    with instrumentation.stage('evolve'):
+        population, fitness, _ = evolve_population(population, index, generations, rng, **options)
+    return population[np.argmax(fitness)]
@@ -0,0 +1,191 @@
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import LabelEncoder
+
+import data_cache
+import performance_model
+
+LEADERBOARD_FILE = 'hyperparam_leaderboard.csv'
+SEARCH_CACHE_DIR = os.path.join(data_cache.CACHE_DIR, 'search')
+
+# Rows per latency probe: roughly one squad
+LATENCY_BATCH = 25
+
+PARAM_GRID = {
+    'n_estimators': [50, 100, 200],
+    'max_depth': [None, 8, 16],
+    'min_samples_leaf': [1, 3],
+    'max_features': ['sqrt', None],
+}
+
+
+def candidate_configs(grid=PARAM_GRID):
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def prepare_folds(data_file=performance_model.DATA_FILE, encoding='ordinal', n_folds=5, seed=42,
+                  cache_dir=SEARCH_CACHE_DIR):
+    """Encode the training data and assign stratified folds once, cached on disk.
+
+    Returns the cache directory holding X.npy, y.npy and fold.npy (the fold
+    number of every row). The key covers the source file's content hash,
+    the encoding, the fold count and the seed.
+    """
+    source_hash = data_cache.file_hash(data_file)
+    key = hashlib.sha1(json.dumps([source_hash, encoding, n_folds, seed]).encode()).hexdigest()[:12]
+    path = os.path.join(cache_dir, key)
+    if os.path.exists(os.path.join(path, 'fold.npy')):
+        return path
+
+    df = performance_model.load_training_data(data_file)
+    layout = performance_model.feature_layout(df, encoding)
+    X = performance_model.encode(df, layout)
+    if hasattr(X, 'toarray'):
+        X = X.toarray()
+    y = LabelEncoder().fit_transform(df[performance_model.TARGET].astype(str))
+
+    fold = np.empty(len(y), dtype=np.int8)
+    splitter = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed)
+    for k, (_, test) in enumerate(splitter.split(X, y)):
+        fold[test] = k
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, 'X.npy'), X)
+    np.save(os.path.join(path, 'y.npy'), y)
+    np.save(os.path.join(path, 'fold.npy'), fold)
+    return path
+
+
+_fold_data = {}
+
+
+# Worker initializer: memory-map the cached matrices once per process
+def _load_folds(path):
+    _fold_data['X'] = np.load(os.path.join(path, 'X.npy'), mmap_mode='r')
+    _fold_data['y'] = np.load(os.path.join(path, 'y.npy'), mmap_mode='r')
+    _fold_data['fold'] = np.load(os.path.join(path, 'fold.npy'), mmap_mode='r')
+
+
+def _evaluate(job):
+    config_id, config, folds, seed = job
+    X, y, fold = _fold_data['X'], _fold_data['y'], _fold_data['fold']
+    accuracies, fit_seconds, predict_ms = [], [], []
+
+    for k in folds:
+        test = fold == k
+        model = RandomForestClassifier(random_state=seed, **config)
+        started = time.perf_counter()
+        model.fit(X[~test], y[~test])
+        fit_seconds.append(time.perf_counter() - started)
+
+        accuracies.append(float((model.predict(X[test]) == y[test]).mean()))
+
+        batch = np.asarray(X[test][:LATENCY_BATCH])
+        started = time.perf_counter()
+        model.predict(batch)
+        predict_ms.append((time.perf_counter() - started) * 1000)
+
+    return {
+        'config_id': config_id,
+        'folds': len(folds),
+        'accuracy': float(np.mean(accuracies)),
+        'accuracy_std': float(np.std(accuracies)),
+        'fit_seconds': float(np.mean(fit_seconds)),
+        'predict_ms': float(np.median(predict_ms)),
+    }
+
+
+def successive_halving(configs, path, n_folds=5, eta=2, min_folds=1, seed=42, processes=None,
+                       latency_budget_ms=None):
+    """Evaluate configs on a growing number of cached folds, keeping the best 1/eta at each rung.
+
+    With a latency budget, configs predicting slower than it are dropped
+    before each rung is ranked, so the survivors are the most accurate
+    configs that can actually be used. Returns a leaderboard DataFrame with
+    one row per config at the last rung it reached, best accuracy first.
+    """
+    survivors = list(range(len(configs)))
+    results = {}
+    rung = 0
+    folds = min_folds
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_load_folds, initargs=(path,)) as pool:
+        while survivors:
+            jobs = [(i, configs[i], list(range(folds)), seed) for i in survivors]
+            for result in pool.map(_evaluate, jobs):
+                result['rung'] = rung
+                results[result['config_id']] = result
+
+            if latency_budget_ms is not None:
+                survivors = [i for i in survivors if results[i]['predict_ms'] <= latency_budget_ms]
+            if folds >= n_folds or len(survivors) <= 1:
+                break
+            ranked = sorted(survivors, key=lambda i: results[i]['accuracy'], reverse=True)
+            survivors = ranked[:max(1, len(ranked) // eta)]
+            folds = min(n_folds, folds * eta)
+            rung += 1
+
+    rows = [{**configs[i], **result} for i, result in results.items()]
+    leaderboard = pd.DataFrame(rows).sort_values(['rung', 'accuracy'], ascending=[False, False])
+    return leaderboard.reset_index(drop=True)
+
+
+def best_within_budget(leaderboard, latency_budget_ms):
+    """The config meeting the latency budget that was evaluated on the most folds, most accurate first.
+
+    Every rung is eligible, so a fast config pruned early still beats
+    reporting nothing.
+    """
+    fits = leaderboard[leaderboard['predict_ms'] <= latency_budget_ms]
+    fits = fits.sort_values(['rung', 'accuracy'], ascending=[False, False])
+    return fits.iloc[0] if not fits.empty else None
+
+
+# Leaderboard cell back to a plain Python parameter value (NaN -> None, numpy scalars -> int/float)
+def _plain(value):
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-validated hyperparameter search for the batting model.")
+    parser.add_argument('--data', default=performance_model.DATA_FILE)
+    parser.add_argument('--encoding', choices=performance_model.ENCODINGS, default='ordinal')
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--eta', type=int, default=2, help="Keep the best 1/eta configs at every rung")
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--latency-budget-ms', type=float, default=None,
+                        help=f"Report the best config predicting {LATENCY_BATCH} rows within this budget")
+    parser.add_argument('-o', '--output', default=LEADERBOARD_FILE)
+    args = parser.parse_args()
+
+    path = prepare_folds(args.data, args.encoding, args.folds)
+    leaderboard = successive_halving(candidate_configs(), path, args.folds, args.eta, processes=args.processes,
+                                     latency_budget_ms=args.latency_budget_ms)
+    leaderboard.to_csv(args.output, index=False)
+    print(leaderboard.head(10).to_string(index=False))
+    print(f"Leaderboard saved to {args.output}")
+
+    if args.latency_budget_ms is not None:
+        best = best_within_budget(leaderboard, args.latency_budget_ms)
+        if best is None:
+            print(f"No configuration predicts within {args.latency_budget_ms} ms.")
+        else:
+            params = {key: _plain(best[key]) for key in PARAM_GRID}
+            print(f"Best within {args.latency_budget_ms} ms: {params} "
+                  f"(accuracy {best['accuracy']:.4f}, {best['predict_ms']:.2f} ms)")
+
+if __name__ == "__main__":
+    main()
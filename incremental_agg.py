@@ -0,0 +1,202 @@
+import argparse
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+KEYS = ['Venue', 'Player_bat']
+FIRST_COLUMNS = ['p_id', 'Country_bat']
+SUM_COLUMNS = ['matches_played_bat', 'total_runs', 'matches_played_bowl', 'total_runs_conceded',
+               'balls_bowled', 'total_wickets']
+MEAN_COLUMNS = ['batting_average', 'economy', 'Bowling_Strike_Rate']
+MODE_COLUMNS = ['Performance_bat', 'Performance_bowl']
+
+# Same column order as the groupby/agg in common.py
+OUTPUT_COLUMNS = KEYS + [
+    'p_id', 'Country_bat', 'matches_played_bat', 'total_runs', 'batting_average', 'Performance_bat',
+    'matches_played_bowl', 'total_runs_conceded', 'balls_bowled', 'economy', 'total_wickets',
+    'Bowling_Strike_Rate', 'Performance_bowl',
+]
+
+OUTPUT_FILE = 'cleaned_player_stats_in_venues.csv'
+STATE_FILE = 'cleaned_player_stats_in_venues.state.pkl'
+
+
+def _empty_index():
+    return pd.MultiIndex.from_tuples([], names=KEYS)
+
+
+# "venue\0player" strings sort like the (Venue, Player_bat) tuples, so sorted positions are a binary search away
+def _sort_keys(index):
+    venues = pd.Series(index.get_level_values(0), dtype=object).astype(str)
+    players = pd.Series(index.get_level_values(1), dtype=object).astype(str)
+    return (venues + '\0' + players).to_numpy(dtype=object)
+
+
+# Add `update` into `frame` on `columns`: existing keys in place, new keys appended (with all their columns)
+def _accumulate(frame, update, columns):
+    if frame.empty:
+        return update.copy()
+    positions = frame.index.get_indexer(update.index)
+    found = positions >= 0
+    if found.any():
+        rows, cols = positions[found], frame.columns.get_indexer(columns)
+        frame.iloc[rows, cols] = frame.iloc[rows, cols].to_numpy() + update.loc[found, columns].to_numpy()
+    if not found.all():
+        frame = pd.concat([frame, update[~found]])
+    return frame
+
+
+class AggregationState:
+    """Running per-(Venue, Player_bat) totals from which cleaned rows are derived.
+
+    totals holds the first p_id/Country_bat, sums, and sum/count pairs for
+    the mean columns; frequencies holds a (Venue, Player_bat) x label count
+    table per mode column; table is the current cleaned output, kept in key
+    order. Updates touch only the keys in the new rows: existing groups are
+    changed in place and new groups are appended (totals, frequencies) or
+    inserted at their sorted position (table), so nothing is re-aligned or
+    re-sorted as a whole.
+    """
+
+    def __init__(self):
+        columns = FIRST_COLUMNS + SUM_COLUMNS + [f'{c}_sum' for c in MEAN_COLUMNS] + [f'{c}_count' for c in MEAN_COLUMNS]
+        self.totals = pd.DataFrame(columns=columns, index=_empty_index(), dtype=float)
+        self.totals[FIRST_COLUMNS] = self.totals[FIRST_COLUMNS].astype(object)
+        self.frequencies = {column: pd.DataFrame(index=_empty_index(), dtype=np.int64) for column in MODE_COLUMNS}
+        self.table = pd.DataFrame(columns=OUTPUT_COLUMNS[2:], index=_empty_index())
+        self.table_keys = np.array([], dtype=object)
+
+    def add_chunk(self, chunk):
+        """Fold a chunk of raw rows into the running totals; returns the affected group keys."""
+        chunk = chunk.copy()
+        chunk['Venue'] = chunk['Venue'].str.strip()
+        grouped = chunk.groupby(KEYS, sort=False)
+
+        update = grouped[FIRST_COLUMNS].first().astype(object)
+        update = update.join(grouped[SUM_COLUMNS].sum().astype(float))
+        update = update.join(grouped[MEAN_COLUMNS].sum().astype(float).add_suffix('_sum'))
+        update = update.join(grouped[MEAN_COLUMNS].count().astype(float).add_suffix('_count'))
+
+        numeric = [c for c in self.totals.columns if c not in FIRST_COLUMNS]
+        # Existing groups keep their first p_id/Country_bat; only their numeric totals change
+        self.totals = _accumulate(self.totals, update[self.totals.columns], numeric)
+
+        for column in MODE_COLUMNS:
+            counts = chunk.groupby(KEYS + [column], sort=False).size().unstack(fill_value=0)
+            frequencies = self.frequencies[column]
+            labels = frequencies.columns.union(counts.columns).sort_values()
+            if len(labels) != len(frequencies.columns):
+                frequencies = frequencies.reindex(columns=labels, fill_value=0)
+            counts = counts.reindex(columns=labels, fill_value=0).astype(np.int64)
+            self.frequencies[column] = _accumulate(frequencies, counts, labels)
+
+        return update.index
+
+    def refresh(self, keys):
+        """Recompute the cleaned rows for the given group keys only."""
+        totals = self.totals.iloc[self.totals.index.get_indexer(keys)]
+        rows = totals[FIRST_COLUMNS].copy()
+        for column in SUM_COLUMNS:
+            rows[column] = totals[column]
+        for column in MEAN_COLUMNS:
+            rows[column] = totals[f'{column}_sum'] / totals[f'{column}_count'].replace(0, np.nan)
+        for column in MODE_COLUMNS:
+            rows[column] = self._modes(column, totals.index)
+        rows = rows[OUTPUT_COLUMNS[2:]]
+
+        positions = self.table.index.get_indexer(rows.index) if len(self.table) else np.full(len(rows), -1)
+        found = positions >= 0
+        if found.any():
+            for i, column in enumerate(rows.columns):
+                self.table.iloc[positions[found], i] = rows[column].to_numpy()[found]
+        if not found.all():
+            self._insert(rows[~found])
+
+    # Insert new groups at their sorted positions: a binary search and one gather, no re-sort of the table
+    def _insert(self, rows):
+        keys = _sort_keys(rows.index)
+        order = np.argsort(keys, kind='stable')
+        rows, keys = rows.iloc[order], keys[order]
+        if self.table.empty:
+            self.table, self.table_keys = rows, keys
+            return
+        positions = np.searchsorted(self.table_keys, keys)
+        size = len(self.table)
+        take = np.insert(np.arange(size), positions, np.arange(size, size + len(rows)))
+        self.table = pd.concat([self.table, rows]).iloc[take]
+        self.table_keys = np.insert(self.table_keys, positions, keys)
+
+    # Most frequent label per group, ties broken by the smallest label (as Series.mode() does)
+    def _modes(self, column, keys):
+        frequencies = self.frequencies[column]
+        modes = np.full(len(keys), np.nan, dtype=object)
+        positions = frequencies.index.get_indexer(keys) if len(frequencies) else np.full(len(keys), -1)
+        found = positions >= 0
+        if found.any():
+            # Label columns are sorted, so argmax's first maximum is the smallest tied label
+            counts = frequencies.iloc[positions[found]].to_numpy()
+            labels = frequencies.columns.to_numpy(dtype=object)[counts.argmax(axis=1)]
+            modes[found] = np.where(counts.max(axis=1) > 0, labels, np.nan)
+        return pd.Series(modes, index=keys, dtype=object)
+
+    def output(self):
+        table = self.table.reset_index()[OUTPUT_COLUMNS]
+        for column in SUM_COLUMNS:
+            values = table[column].astype(float)
+            table[column] = values.astype(np.int64) if (values % 1 == 0).all() else values
+        return table
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(path):
+        if not os.path.exists(path):
+            return AggregationState()
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+def update(new_rows_file, state_file=STATE_FILE, output_file=OUTPUT_FILE, chunksize=50_000, changes_file=None):
+    """Stream new raw rows into the aggregation state and rewrite the cleaned CSV.
+
+    Only groups that appear in the new rows are recomputed, so the
+    aggregation work grows with the new data rather than the whole history.
+    The cleaned CSV and the saved state are still rewritten in full, as
+    consumers read one file; `changes_file` additionally gets just the
+    recomputed rows. With no saved state this is a full build.
+    """
+    state = AggregationState.load(state_file)
+    affected = []
+    for chunk in pd.read_csv(new_rows_file, chunksize=chunksize):
+        affected.append(state.add_chunk(chunk))
+
+    affected = pd.MultiIndex.from_frame(pd.concat([keys.to_frame(index=False) for keys in affected]).drop_duplicates()) \
+        if affected else _empty_index()
+    state.refresh(affected)
+    output = state.output()
+    output.to_csv(output_file, index=False)
+    if changes_file:
+        changed = pd.MultiIndex.from_frame(output[KEYS]).isin(affected)
+        output[changed].to_csv(changes_file, index=False)
+    state.save(state_file)
+    return len(affected)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge new player-in-venue rows into the cleaned stats.")
+    parser.add_argument('new_rows', help="CSV of new rows in the player_stats_in_venues.csv schema")
+    parser.add_argument('--state', default=STATE_FILE)
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    parser.add_argument('--chunksize', type=int, default=50_000)
+    parser.add_argument('--changes', default=None, help="Also write only the recomputed rows to this CSV")
+    args = parser.parse_args()
+
+    changed = update(args.new_rows, args.state, args.output, args.chunksize, args.changes)
+    print(f"Updated {changed} venue/player groups in {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import atexit
+import contextlib
+import csv
+import json
+import os
+import time
+from collections import defaultdict
+
+# Set to a .json or .csv path to trace every run of a script and write the trace on exit
+TRACE_ENV = 'SELECTOR_TRACE'
+
+_NULL_STAGE = contextlib.nullcontext()
+_active = None
+
+
+class Trace:
+    """Stage timings, counters, per-generation fitness and per-run fitness-cache stats collected while tracing is on."""
+
+    def __init__(self):
+        self.stages = defaultdict(lambda: {'calls': 0, 'seconds': 0.0})
+        self.counters = defaultdict(int)
+        self.generations = []
+        self.fitness_caches = []
+        self._stack = []
+
+    @property
+    def current_stage(self):
+        return '/'.join(self._stack)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        self._stack.append(name)
+        path = self.current_stage
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[path]['calls'] += 1
+            self.stages[path]['seconds'] += time.perf_counter() - started
+            self._stack.pop()
+
+    def as_dict(self):
+        return {
+            'stages': {path: dict(stage) for path, stage in self.stages.items()},
+            'counters': dict(self.counters),
+            'generations': list(self.generations),
+            'fitness_caches': list(self.fitness_caches),
+        }
+
+    def to_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+    def to_csv(self, path):
+        """Per-generation convergence rows: stage, run, generation, best, mean."""
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['stage', 'run', 'generation', 'best', 'mean'])
+            writer.writeheader()
+            writer.writerows(self.generations)
+
+    def save(self, path):
+        if path.endswith('.csv'):
+            self.to_csv(path)
+        else:
+            self.to_json(path)
+
+    def summary(self):
+        lines = [f"{path:50s} {stage['calls']:6d} calls {stage['seconds'] * 1000:10.2f} ms"
+                 for path, stage in sorted(self.stages.items())]
+        lines += [f"{name:50s} {value:>10}" for name, value in sorted(self.counters.items())]
+        lookups = self.counters['fitness_cache_hits'] + self.counters['fitness_cache_misses']
+        if lookups:
+            lines.append(f"{'fitness_cache_hit_rate':50s} {self.counters['fitness_cache_hits'] / lookups:>10.3f}")
+        return '\n'.join(lines)
+
+
+def enabled():
+    return _active is not None
+
+
+def start():
+    """Begin collecting into a fresh Trace and return it."""
+    global _active
+    _active = Trace()
+    return _active
+
+
+def stop():
+    """Stop collecting and return the finished Trace (None if tracing was off)."""
+    global _active
+    trace, _active = _active, None
+    return trace
+
+
+@contextlib.contextmanager
+def tracing():
+    trace = start()
+    try:
+        yield trace
+    finally:
+        stop()
+
+
+def stage(name):
+    """Time a block under `name`, nested inside the enclosing stage; a no-op context when disabled."""
+    if _active is None:
+        return _NULL_STAGE
+    return _active.stage(name)
+
+
+def count(name, amount=1):
+    if _active is not None:
+        _active.counters[name] += amount
+
+
+def new_run():
+    """Number the next GA run so its generations can be told apart in the trace."""
+    if _active is None:
+        return None
+    _active.counters['ga_runs'] += 1
+    return _active.counters['ga_runs']
+
+
+def generation(run, number, best, mean):
+    if _active is not None:
+        _active.generations.append({'stage': _active.current_stage, 'run': run,
+                                    'generation': number, 'best': best, 'mean': mean})
+
+
+def fitness_cache(run, stats):
+    """Record a FitnessCache's stats (FitnessCache.stats()) at the end of a GA run."""
+    if _active is not None:
+        _active.fitness_caches.append({'stage': _active.current_stage, 'run': run, **stats})
+
+
+# Opt-in from the environment: SELECTOR_TRACE=trace.json python team_selector.py
+def _trace_from_environment():
+    path = os.environ.get(TRACE_ENV)
+    if not path:
+        return
+    start()
+    atexit.register(lambda: _active is not None and _active.save(path))
+
+_trace_from_environment()
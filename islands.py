@@ -0,0 +1,97 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import ga_engine
+
+
+# Run one island for one epoch; the RNG is derived from (seed, island, epoch) so results are reproducible
+def _run_island(args):
+    index, population, generations, seed, island, epoch, options = args
+    rng = np.random.default_rng([seed, island, epoch])
+    if population is None:
+        population = ga_engine.random_population(index, options.pop('population_size'), rng)
+    else:
+        options.pop('population_size')
+
+    started = time.perf_counter()
+    population, fitness, history = ga_engine.evolve_population(population, index, generations, rng, **options)
+    return population, fitness, history, time.perf_counter() - started
+
+
+# Ring migration: each island's worst teams are replaced by the previous island's best
+def _migrate(populations, fitnesses, migrants):
+    if migrants <= 0 or len(populations) < 2:
+        return populations
+    elites = [pop[np.argsort(-fit, kind='stable')[:migrants]] for pop, fit in zip(populations, fitnesses)]
+    migrated = []
+    for i, (pop, fit) in enumerate(zip(populations, fitnesses)):
+        pop = pop.copy()
+        pop[np.argsort(fit, kind='stable')[:migrants]] = elites[i - 1]
+        migrated.append(pop)
+    return migrated
+
+
+def run_islands(index, n_islands=None, epochs=5, generations_per_epoch=10, population_size=200,
+                migrants=2, seed=42, processes=None, **options):
+    """Island-model GA: evolve `n_islands` independent populations in a process pool.
+
+    After every epoch of `generations_per_epoch` generations the best
+    `migrants` teams of each island replace the worst teams of the next one.
+    Each island is seeded from (seed, island, epoch), so a run is fully
+    deterministic for a given seed and island count regardless of how the
+    pool schedules the work.
+
+    Returns (best_team, best_fitness, stats) where best_team is an ID array
+    (None if no valid team exists) and stats holds one dict per island.
+    """
+    if epochs < 1:
+        raise ValueError(f"epochs must be at least 1, got {epochs}")
+    n_islands = n_islands or os.cpu_count() or 1
+    if not index.is_feasible():
+        return None, None, []
+
+    populations = [None] * n_islands
+    stats = [{'island': i, 'best': [], 'mean': [], 'generations': 0, 'seconds': 0.0} for i in range(n_islands)]
+
+    with ProcessPoolExecutor(max_workers=processes or min(n_islands, os.cpu_count() or 1)) as pool:
+        for epoch in range(epochs):
+            jobs = [
+                (index, populations[i], generations_per_epoch, seed, i, epoch,
+                 dict(options, population_size=population_size))
+                for i in range(n_islands)
+            ]
+            results = list(pool.map(_run_island, jobs))
+
+            populations = [result[0] for result in results]
+            fitnesses = [result[1] for result in results]
+            for island_stats, (_, _, history, seconds) in zip(stats, results):
+                island_stats['best'].extend(best for best, _ in history)
+                island_stats['mean'].extend(mean for _, mean in history)
+                island_stats['generations'] += len(history)
+                island_stats['seconds'] += seconds
+
+            if epoch < epochs - 1:
+                populations = _migrate(populations, fitnesses, migrants)
+
+    best_island = max(range(n_islands), key=lambda i: fitnesses[i].max())
+    best = int(np.argmax(fitnesses[best_island]))
+    for island_stats, fitness in zip(stats, fitnesses):
+        island_stats['final_best'] = float(fitness.max())
+    return populations[best_island][best], float(fitnesses[best_island][best]), stats
+
+
+# team_selector entry point: filtered batters/bowlers frames in, 12 names out
+def team_selector_islands(batters, bowlers, **kwargs):
+    index = ga_engine.encode_squad(batters, bowlers)
+    team, best_fitness, stats = run_islands(index, **kwargs)
+    return (index.team_names(team) if team is not None else []), best_fitness, stats
+
+
+# ts2 entry point: a ts2 player table in, the selected players' records out
+def ts2_islands(players, **kwargs):
+    index = ga_engine.index_from_records(players)
+    team, best_fitness, stats = run_islands(index, **kwargs)
+    return (players[team] if team is not None else players[:0]), best_fitness, stats
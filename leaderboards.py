@@ -0,0 +1,153 @@
+import argparse
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import stats_store
+
+LEADERBOARD_FILE = 'venue_leaderboards.csv'
+
+# Performance labels as an ordinal score (higher is better); unknown labels rank below Bad
+PERFORMANCE_SCORE = {'Excellent': 4, 'Good': 3, 'Average': 2, 'Poor': 1, 'Bad': 0}
+UNRANKED = -1
+
+# Ranking keys after the performance score: (column, ascending)
+BATTER_TIEBREAKERS = [('total_runs', False), ('batting_average', False)]
+BOWLER_TIEBREAKERS = [('total_wickets', False), ('economy', True)]
+
+# Venue boards kept, most recently used first out
+CACHE_SIZE = 512
+ROLES = ('batter', 'bowler')
+
+
+def performance_score(labels):
+    return pd.Series(labels).map(PERFORMANCE_SCORE).fillna(UNRANKED).to_numpy(dtype=np.int8)
+
+
+def rank(table, tiebreakers):
+    """Rows grouped by venue and ordered best first within each venue.
+
+    Adds performance_score (the ordinal Performance label) and venue_rank
+    (0 = best at that venue). Ties on the score are broken by the
+    `tiebreakers` columns in order; missing values rank last.
+    """
+    table = table.assign(performance_score=performance_score(table['Performance']))
+    sort_keys = []
+    for column, ascending in [('performance_score', False)] + tiebreakers:
+        values = pd.to_numeric(table[column], errors='coerce').to_numpy(dtype=np.float64)
+        values = values if ascending else -values
+        sort_keys.append(np.nan_to_num(values, nan=np.inf))
+    venues = stats_store.venue_keys(table)
+    # np.lexsort sorts by the last key first: venue, then score, then each tie-breaker
+    order = np.lexsort(sort_keys[::-1] + [venues])
+    ranked = table.iloc[order]
+    return ranked.assign(venue_rank=ranked.groupby(venues[order], sort=False).cumcount().to_numpy())
+
+
+TIEBREAKERS = {'batter': BATTER_TIEBREAKERS, 'bowler': BOWLER_TIEBREAKERS}
+
+# Columns leading the materialized file, for reading it by eye; every other table column follows
+DISPLAY_COLUMNS = ['role', 'Venue', 'venue_rank', 'Player', 'Country', 'Performance', 'performance_score',
+                   'total_runs', 'batting_average', 'total_wickets', 'economy']
+
+# {(role, venue key, source hash): (ranked rows, their player keys)}
+_cache = OrderedDict()
+# Source hashes already looked up in the materialized file
+_warmed = set()
+
+
+def _store(key, rows):
+    _cache[key] = (rows, stats_store.normalize_series(rows['Player']).to_numpy())
+    _cache.move_to_end(key)
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return _cache[key]
+
+
+# Warm start: cache every board of `source` found in the materialized file (other sources' rows are stale)
+def _warm(source, path=LEADERBOARD_FILE):
+    _warmed.add(source)
+    if not os.path.exists(path):
+        return
+    frame = pd.read_csv(path, dtype={'source_hash': str})
+    frame = frame[frame['source_hash'] == source]
+    if frame.empty:
+        return
+    frame = frame.set_index(stats_store.INDEX_NAMES)
+    for (role, venue), rows in frame.groupby(['role', frame.index.get_level_values('venue_key')], sort=False):
+        _store((role, venue, source), rows.drop(columns=['role', 'source_hash']))
+
+
+class Leaderboards:
+    """Per-venue batter and bowler boards, each ranked once, so selection only filters presorted rows.
+
+    Boards of the stats store's tables (and of slices of them) are cached by
+    (venue key, source hash) - the hash of the files the tables were built
+    from (stats_store.SOURCE_ATTR) - and on first use of a source are read
+    back from the file `python leaderboards.py` materializes. Boards of
+    other frames are ranked on every call.
+    """
+
+    def __init__(self, batter_stats, bowler_stats):
+        self.tables = {'batter': batter_stats, 'bowler': bowler_stats}
+
+    def board(self, role, venue):
+        """(ranked rows, their player keys) of one role at one venue."""
+        table = self.tables[role]
+        source = table.attrs.get(stats_store.SOURCE_ATTR)
+        key = (role, stats_store.venue_key(venue), source)
+        if source is not None:
+            if source not in _warmed:
+                _warm(source)
+            entry = _cache.get(key)
+            # A filtered slice carries the tables' hash too; only whole-venue slices share the cached board
+            if entry is not None and len(entry[0]) == stats_store.venue_size(table, venue):
+                _cache.move_to_end(key)
+                return entry
+
+        ranked = rank(stats_store.venue_rows(table, venue), TIEBREAKERS[role])
+        if source is not None and key not in _cache:
+            return _store(key, ranked)
+        return ranked, stats_store.normalize_series(ranked['Player']).to_numpy()
+
+    def _squad_rows(self, role, squad, venue):
+        rows, players = self.board(role, venue)
+        return rows[np.isin(players, [stats_store.normalize(player) for player in squad])]
+
+    def squad(self, squad, venue):
+        """(batters, bowlers) rows for the squad at the venue, best first; a filter of each venue board."""
+        return self._squad_rows('batter', squad, venue), self._squad_rows('bowler', squad, venue)
+
+    def to_frame(self):
+        """Every venue's boards in one frame, with role and source hash columns and the (venue, player) keys."""
+        frames = []
+        for role, table in self.tables.items():
+            venues = pd.unique(np.asarray(table['Venue'].astype(str)))
+            frames += [self.board(role, venue)[0].assign(role=role) for venue in venues]
+        frame = pd.concat(frames).assign(source_hash=self.tables['batter'].attrs.get(stats_store.SOURCE_ATTR))
+        leading = [column for column in DISPLAY_COLUMNS if column in frame.columns]
+        return frame[leading + [column for column in frame.columns if column not in leading]]
+
+
+def get(batter_stats, bowler_stats):
+    """Leaderboards over a pair of stats tables; their venue boards are built (or read back) once per source."""
+    return Leaderboards(batter_stats, bowler_stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Materialize per-venue batter and bowler leaderboards.")
+    parser.add_argument('-o', '--output', default=LEADERBOARD_FILE)
+    parser.add_argument('--batter-file', default=stats_store.BATTER_FILE)
+    parser.add_argument('--bowler-file', default=stats_store.BOWLER_FILE)
+    parser.add_argument('--players-file', default=stats_store.PLAYERS_FILE)
+    args = parser.parse_args()
+
+    store = stats_store.get_store(args.batter_file, args.bowler_file, args.players_file)
+    frame = get(store.batters, store.bowlers).to_frame()
+    frame.to_csv(args.output)
+    print(f"Saved {len(frame)} ranked rows for {frame['Venue'].nunique()} venues to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+import argparse
+import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+import ga_engine
+import matchups
+
+OVERS = 20
+BALLS_PER_OVER = 6
+MAX_OVERS_PER_BOWLER = 4
+BATTING_SLOTS = 11
+
+# Ball outcomes after a dismissal: runs scored off the bat, and a typical T20 split used as the prior shape
+RUN_VALUES = np.array([0, 1, 2, 3, 4, 6])
+BASE_RUN_PROBS = np.array([0.40, 0.36, 0.07, 0.005, 0.11, 0.055])
+
+# Balls of evidence the type-level (and global) rates count for when shrinking sparse pair records
+PRIOR_BALLS = 12
+
+# Innings per process-pool job when simulating a single XI
+CHUNK_INNINGS = 5000
+
+
+# Tilt BASE_RUN_PROBS to each target mean runs per ball (Newton steps on the exponential tilt)
+def _run_distribution(mean):
+    mean = np.clip(mean, 0.05, 5.0)[..., None]
+    theta = np.zeros_like(mean)
+    for _ in range(25):
+        weights = BASE_RUN_PROBS * np.exp(theta * RUN_VALUES)
+        probs = weights / weights.sum(axis=-1, keepdims=True)
+        expected = (probs * RUN_VALUES).sum(axis=-1, keepdims=True)
+        variance = (probs * RUN_VALUES ** 2).sum(axis=-1, keepdims=True) - expected ** 2
+        theta = theta - (expected - mean) / np.maximum(variance, 1e-9)
+    weights = BASE_RUN_PROBS * np.exp(theta * RUN_VALUES)
+    return weights / weights.sum(axis=-1, keepdims=True)
+
+
+class BallModel:
+    """Per-ball dismissal and run probabilities for batter x bowler pairs.
+
+    Rates come from batter_bowler_analysis.csv: each pair's record is shrunk
+    towards the batter's record against the bowler's bowling type, which is
+    in turn shrunk towards the all-pairs rate, so pairs that have never met
+    fall back to the type (and then global) rates.
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine or matchups.MatchupEngine()
+        total_balls = self.engine.type_balls.sum()
+        self.dismissal_rate = self.engine.type_dismissals.sum() / total_balls
+        self.runs_per_ball = self.engine.type_runs.sum() / total_balls
+
+    def outcome_cdf(self, batters, bowlers):
+        """Cumulative outcome probabilities (dismissal, then RUN_VALUES) shaped (batters, bowlers, 7)."""
+        engine = self.engine
+        batter_ids, bowler_ids = engine.batter_ids(batters), engine.bowler_ids(bowlers)
+        type_runs, type_balls, type_dismissals = engine.type_totals(batter_ids, bowler_ids)
+        pair_runs, pair_balls, pair_dismissals = engine.pair_totals(batter_ids, bowler_ids)
+
+        type_out = (type_dismissals + PRIOR_BALLS * self.dismissal_rate) / (type_balls + PRIOR_BALLS)
+        type_rpb = (type_runs + PRIOR_BALLS * self.runs_per_ball) / (type_balls + PRIOR_BALLS)
+        out = (pair_dismissals + PRIOR_BALLS * type_out) / (pair_balls + PRIOR_BALLS)
+        runs_per_ball = (pair_runs + PRIOR_BALLS * type_rpb) / (pair_balls + PRIOR_BALLS)
+
+        runs = _run_distribution(runs_per_ball / (1 - out)) * (1 - out)[..., None]
+        cdf = np.cumsum(np.concatenate([out[..., None], runs], axis=-1), axis=-1)
+        # Rounding can leave the total just below 1; a draw above it would index past the last outcome
+        cdf[..., -1] = 1.0
+        return cdf
+
+
+@lru_cache(maxsize=None)
+def get_model(matchup_file=matchups.MATCHUP_FILE):
+    """Process-wide BallModel, built on first use."""
+    return BallModel(matchups.MatchupEngine(matchup_file))
+
+
+def bowling_plan(n_bowlers, overs=OVERS):
+    """Bowler slot for every over, rotating through the attack.
+
+    With five or more bowlers nobody exceeds MAX_OVERS_PER_BOWLER; smaller
+    attacks have to bowl the extra overs.
+    """
+    if n_bowlers < 1:
+        raise ValueError("The bowling attack is empty")
+    return np.arange(overs) % n_bowlers
+
+
+# An innings needs an opening pair and at least one bowler
+def _check_sides(n_batters, n_bowlers):
+    if n_batters < 2:
+        raise ValueError(f"The batting order needs at least 2 players, got {n_batters}")
+    if n_bowlers < 1:
+        raise ValueError("The bowling attack is empty")
+
+
+def simulate_innings(cdf, plan, n_innings, seed=None):
+    """Simulate innings for every line-up at once; returns (runs, wickets), each shaped (lineups, n_innings).
+
+    cdf is (lineups, batters, bowlers, 7) from BallModel.outcome_cdf with the
+    batters in batting order. All line-ups share the same random draws
+    (common random numbers), so their results are directly comparable and
+    do not depend on how line-ups are batched.
+    """
+    rng = np.random.default_rng(seed)
+    n_lineups, n_batters = cdf.shape[:2]
+    lineup = np.arange(n_lineups)[:, None]
+    shape = (n_lineups, n_innings)
+    striker = np.zeros(shape, dtype=np.int64)
+    non_striker = np.ones(shape, dtype=np.int64)
+    next_in = np.full(shape, 2, dtype=np.int64)
+    wickets = np.zeros(shape, dtype=np.int64)
+    runs = np.zeros(shape, dtype=np.int64)
+    batting = np.ones(shape, dtype=bool)
+    run_values = np.concatenate([[0], RUN_VALUES])
+
+    for bowler in plan:
+        for _ in range(BALLS_PER_OVER):
+            draw = rng.random(n_innings)
+            outcome = (draw[None, :, None] > cdf[lineup, striker, bowler]).sum(axis=-1)
+            out = batting & (outcome == 0)
+            scored = np.where(batting, run_values[outcome], 0)
+            runs += scored
+            wickets += out
+            striker = np.where(out, np.minimum(next_in, n_batters - 1), striker)
+            next_in += out
+            batting &= wickets < n_batters - 1
+
+            swap = scored % 2 == 1
+            striker, non_striker = np.where(swap, non_striker, striker), np.where(swap, striker, non_striker)
+        striker, non_striker = non_striker, striker
+    return runs, wickets
+
+
+def _simulate_job(job):
+    cdf, plan, n_innings, seed = job
+    return simulate_innings(cdf, plan, n_innings, seed)
+
+
+def simulate_xi(batting_order, attack, n_innings=20000, target=None, seed=None, processes=None, model=None):
+    """Distribution of the XI's innings total against an attack, simulated in a process pool.
+
+    The innings are split into fixed-size chunks seeded from one
+    SeedSequence, so results for a given seed do not depend on the number
+    of processes. Returns expected runs, their spread, the all-out rate and,
+    with a target, the probability of passing it and the expected margin.
+    """
+    _check_sides(len(batting_order), len(attack))
+    model = model or get_model()
+    cdf = model.outcome_cdf(batting_order[:BATTING_SLOTS], attack)[None]
+    plan = bowling_plan(len(attack))
+    chunks = math.ceil(n_innings / CHUNK_INNINGS)
+    seeds = np.random.SeedSequence(seed).spawn(chunks)
+    jobs = [(cdf, plan, min(CHUNK_INNINGS, n_innings - i * CHUNK_INNINGS), seeds[i]) for i in range(chunks)]
+
+    if processes == 1 or chunks == 1:
+        results = list(map(_simulate_job, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_simulate_job, jobs))
+    runs = np.concatenate([result[0][0] for result in results])
+    wickets = np.concatenate([result[1][0] for result in results])
+
+    summary = {
+        'innings': int(len(runs)),
+        'expected_runs': float(runs.mean()),
+        'runs_std': float(runs.std()),
+        'all_out_rate': float((wickets >= min(len(batting_order), BATTING_SLOTS) - 1).mean()),
+    }
+    if target is not None:
+        summary['win_probability'] = float((runs > target).mean())
+        summary['expected_margin'] = float((runs - target).mean())
+    return summary
+
+
+class SimulationFitness:
+    """GA fitness term from simulated innings of each team against an opposing attack.
+
+    A team bats in a fixed order: players who can bat by descending player
+    score, then the rest; the last of the 12 is the 12th man and does not
+    bat. The term is weight * expected runs or, with a target, weight * 100 *
+    the probability of passing it. Every evaluation reuses `seed`, so a team
+    always gets the same fitness (which is what ga_engine.FitnessCache
+    assumes). With processes > 1 population batches are split across a pool.
+    """
+
+    def __init__(self, index, attack, n_innings=500, target=None, weight=1.0, seed=0, processes=None,
+                 model=None):
+        _check_sides(min(len(index.names), BATTING_SLOTS), len(attack))
+        model = model or get_model()
+        batters = (index.role & ga_engine.ROLE_BATTER) > 0
+        # Lower position = bats earlier
+        self.position = np.lexsort((-index.score, ~batters)).argsort()
+        self.cdf = model.outcome_cdf(index.names, attack)
+        self.plan = bowling_plan(len(attack))
+        self.n_innings = n_innings
+        self.target = target
+        self.weight = weight
+        self.seed = seed
+        self.processes = processes
+        self._pool = None
+
+    def __getstate__(self):
+        return {**self.__dict__, '_pool': None}
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def batting_orders(self, population):
+        order = np.argsort(self.position[population], axis=1, kind='stable')
+        return np.take_along_axis(population, order, axis=1)[:, :BATTING_SLOTS]
+
+    def __call__(self, population):
+        lineups = self.batting_orders(np.atleast_2d(population))
+        cdf = self.cdf[lineups]
+        if self.processes and self.processes > 1 and len(lineups) > 1:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.processes)
+            jobs = [(chunk, self.plan, self.n_innings, self.seed)
+                    for chunk in np.array_split(cdf, min(self.processes, len(lineups)))]
+            runs = np.concatenate([result[0] for result in self._pool.map(_simulate_job, jobs)])
+        else:
+            runs, _ = simulate_innings(cdf, self.plan, self.n_innings, self.seed)
+
+        if self.target is None:
+            return self.weight * runs.mean(axis=1)
+        return self.weight * 100 * (runs > self.target).mean(axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo innings simulation of an XI against a bowling attack.")
+    parser.add_argument('--xi', required=True, help="Comma-separated batting order")
+    parser.add_argument('--attack', required=True, help="Comma-separated opposing bowlers")
+    parser.add_argument('--innings', type=int, default=20000)
+    parser.add_argument('--target', type=float, default=None, help="Score to beat for the win probability")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args()
+
+    xi = [name.strip() for name in args.xi.split(',') if name.strip()]
+    attack = [name.strip() for name in args.attack.split(',') if name.strip()]
+    summary = simulate_xi(xi, attack, args.innings, args.target, args.seed, args.processes)
+    for name, value in summary.items():
+        print(f"{name}: {value:.4f}" if isinstance(value, float) else f"{name}: {value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import numpy as np
+
+import data_schema
+from stats_store import normalize
+
+MATCHUP_FILE = 'batter_bowler_analysis.csv'
+
+# Above this many batter x bowler cells the pair matrices are stored sparse
+DENSE_LIMIT = 4_000_000
+
+
+class MatchupEngine:
+    """Batter-vs-bowler and batter-vs-bowling-type totals packed into matrices.
+
+    Players are addressed by integer IDs (see batter_ids / bowler_ids); the
+    last row/column of every matrix is an all-zero slot for unknown players,
+    so lookups never need masking. Pairs with no balls faced fall back to the
+    batter's record against the bowler's bowling type.
+    """
+
+    def __init__(self, matchup_file=MATCHUP_FILE, dense=None):
+        df = data_schema.load(matchup_file)
+        batters = df['batter'].astype(str)
+        bowlers = df['bowler'].astype(str)
+        bowling_types = df['bowling_type'].astype(str).str.split().str.join(' ')
+
+        self.batter_names = sorted(batters.unique())
+        self.bowler_names = sorted(bowlers.unique())
+        self.bowling_types = sorted(bowling_types.unique())
+        self._batter_ids = {normalize(name): i for i, name in enumerate(self.batter_names)}
+        self._bowler_ids = {normalize(name): i for i, name in enumerate(self.bowler_names)}
+        type_ids = {name: i for i, name in enumerate(self.bowling_types)}
+
+        n_batters, n_bowlers, n_types = len(self.batter_names), len(self.bowler_names), len(self.bowling_types)
+        rows = batters.map(lambda name: self._batter_ids[normalize(name)]).to_numpy()
+        cols = bowlers.map(lambda name: self._bowler_ids[normalize(name)]).to_numpy()
+        types = bowling_types.map(type_ids).to_numpy()
+
+        runs = df['total_runs_against_bowler'].to_numpy(dtype=np.float64)
+        balls = df['balls_faced'].to_numpy(dtype=np.float64)
+        dismissals = df['total_dismissals'].to_numpy(dtype=np.float64)
+
+        # Bowler -> bowling type; unknown bowlers (last slot) get the extra zero type column
+        self.bowler_type = np.full(n_bowlers + 1, n_types, dtype=np.int64)
+        self.bowler_type[cols] = types
+
+        if dense is None:
+            dense = (n_batters + 1) * (n_bowlers + 1) <= DENSE_LIMIT
+        self.dense = dense
+        shape = (n_batters + 1, n_bowlers + 1)
+        self.pair_runs, self.pair_balls, self.pair_dismissals = (
+            self._pack(rows, cols, values, shape) for values in (runs, balls, dismissals))
+
+        type_shape = (n_batters + 1, n_types + 1)
+        self.type_runs, self.type_balls, self.type_dismissals = (
+            _accumulate(rows, types, values, type_shape) for values in (runs, balls, dismissals))
+
+    def _pack(self, rows, cols, values, shape):
+        if self.dense:
+            return _accumulate(rows, cols, values, shape)
+        from scipy import sparse
+        return sparse.csr_matrix((values, (rows, cols)), shape=shape)
+
+    def _pair(self, matrix, batters, bowlers):
+        if self.dense:
+            return matrix[batters, bowlers]
+        flat_batters, flat_bowlers = np.broadcast_arrays(batters, bowlers)
+        values = np.asarray(matrix[flat_batters.ravel(), flat_bowlers.ravel()]).ravel()
+        return values.reshape(flat_batters.shape)
+
+    def batter_ids(self, names):
+        unknown = len(self.batter_names)
+        return np.array([self._batter_ids.get(normalize(name), unknown) for name in names], dtype=np.int64)
+
+    def bowler_ids(self, names):
+        unknown = len(self.bowler_names)
+        return np.array([self._bowler_ids.get(normalize(name), unknown) for name in names], dtype=np.int64)
+
+    def team_matchup(self, batting, attack):
+        """Expected strike rate and dismissals per ball of batting line-ups against bowling attacks.
+
+        batting is a (P, n) array of batter IDs and attack a (P, k) or (k,)
+        array of bowler IDs; a single (n,) line-up is also accepted. Every
+        batter is assumed to face every bowler in proportion to their shared
+        history. Returns (strike_rate, dismissal_rate) arrays of shape (P,)
+        (NaN where no ball has been faced).
+        """
+        batting = np.atleast_2d(batting)
+        attack = np.atleast_2d(attack)
+        batters = batting[:, :, None]
+        bowlers = attack[:, None, :]
+
+        balls = self._pair(self.pair_balls, batters, bowlers)
+        runs = self._pair(self.pair_runs, batters, bowlers)
+        dismissals = self._pair(self.pair_dismissals, batters, bowlers)
+
+        # No head-to-head history: use the batter's record against that bowling type
+        missing = balls == 0
+        if missing.any():
+            types = self.bowler_type[bowlers]
+            balls = np.where(missing, self.type_balls[batters, types], balls)
+            runs = np.where(missing, self.type_runs[batters, types], runs)
+            dismissals = np.where(missing, self.type_dismissals[batters, types], dismissals)
+
+        total_balls = balls.sum(axis=(1, 2))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            strike_rate = 100 * runs.sum(axis=(1, 2)) / total_balls
+            dismissal_rate = dismissals.sum(axis=(1, 2)) / total_balls
+        return strike_rate, dismissal_rate
+
+    def pair_totals(self, batters, bowlers):
+        """(runs, balls, dismissals) of every batter x bowler ID pair, each shaped (len(batters), len(bowlers))."""
+        batters = np.asarray(batters)[:, None]
+        bowlers = np.asarray(bowlers)[None, :]
+        return tuple(self._pair(matrix, batters, bowlers)
+                     for matrix in (self.pair_runs, self.pair_balls, self.pair_dismissals))
+
+    def type_totals(self, batters, bowlers):
+        """The same totals for each batter against each bowler's bowling type."""
+        batters = np.asarray(batters)[:, None]
+        types = self.bowler_type[np.asarray(bowlers)][None, :]
+        return tuple(matrix[batters, types] for matrix in (self.type_runs, self.type_balls, self.type_dismissals))
+
+    def expected(self, batting_xi, attack):
+        """Expected (strike_rate, dismissal_rate) of one XI (names) against one attack (names)."""
+        strike_rate, dismissal_rate = self.team_matchup(self.batter_ids(batting_xi), self.bowler_ids(attack))
+        return float(strike_rate[0]), float(dismissal_rate[0])
+
+
+def _accumulate(rows, cols, values, shape):
+    matrix = np.zeros(shape, dtype=np.float64)
+    np.add.at(matrix, (rows, cols), values)
+    return matrix
+
+
+class MatchupFitness:
+    """GA fitness term rewarding a squad's expected strike rate against a given attack.
+
+    Maps the squad's player IDs to matchup batter IDs once; each call is a
+    single batched team_matchup. The term is
+    weight * (strike_rate - dismissal_penalty * 100 * dismissal_rate), 0 where
+    there is no history.
+    """
+
+    def __init__(self, engine, index, attack, weight=1.0, dismissal_penalty=5.0):
+        self.engine = engine
+        self.batters = engine.batter_ids(index.names)
+        self.attack = engine.bowler_ids(attack)
+        self.weight = weight
+        self.dismissal_penalty = dismissal_penalty
+
+    def __call__(self, population):
+        strike_rate, dismissal_rate = self.engine.team_matchup(self.batters[population], self.attack)
+        term = strike_rate - self.dismissal_penalty * 100 * dismissal_rate
+        return self.weight * np.nan_to_num(term)
@@ -0,0 +1,182 @@
+import bisect
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+import data_schema
+
+# Every dataset's player and venue columns, in priority order: a name's first spelling becomes its display name
+PLAYER_SOURCES = [
+    ('cleaned_player_stats_in_venues_filled.csv', ['Player_bat']),
+    ('updated_batter_stats.csv', ['batter']),
+    ('final_bowler_stats_with_NA.csv', ['bowler']),
+    ('batter_bowler_analysis.csv', ['batter', 'bowler']),
+    ('batter dismissed against perticular bowler type.csv', ['batter']),
+    ('final_cricket_stats_fixed.csv', ['Player']),
+]
+VENUE_SOURCES = [
+    ('cleaned_player_stats_in_venues_filled.csv', ['Venue']),
+    ('updated_batter_stats.csv', ['venue']),
+    ('final_bowler_stats_with_NA.csv', ['venue']),
+]
+
+# Spellings of the same ground that no generic rule can match
+VENUE_ALIASES = {
+    'Dr. Y.S. Rajasekhara Reddy ACA-VDCA Cricket Stadium, Visakhapatnam':
+        'Dr YS Rajasekhara Reddy Cricket Stadium (Visakhapatnam)',
+    'Maharaja Yadavindra Singh International Cricket Stadium, Mullanpur':
+        'Maharaja Yadavindra Singh International Cricket St (Mullanpur)',
+}
+
+PLACEHOLDER_NAMES = {'', 'nan', 'unknown', 'n/a'}
+
+
+def key(name):
+    """Lookup key: lowercase, punctuation-free, single-spaced ("Dr. Y.S. Reddy" -> "dr ys reddy")."""
+    return ' '.join(re.sub(r"[.']", '', str(name)).replace('-', ' ').split()).lower()
+
+
+def _trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# "Ground, City" and "Ground (City)" -> the ground and "ground, city" forms
+def venue_aliases(venue):
+    match = re.match(r'^(.*?)\s*(?:,\s*(.+)|\((.+)\))\s*$', venue)
+    if not match:
+        return []
+    ground, city = match.group(1), match.group(2) or match.group(3)
+    return [ground, f'{ground}, {city}']
+
+
+class NameIndex:
+    """Canonical integer IDs for one kind of name, with alias, prefix and fuzzy lookups.
+
+    IDs follow the order names were first added. Aliases map extra
+    spellings to an existing name; a generated alias shared by two names is
+    dropped rather than guessed. Autocomplete bisects a sorted list of every
+    word-start suffix; fuzzy search only scores names sharing a trigram with
+    the query.
+    """
+
+    def __init__(self, names, aliases=()):
+        self.names = []
+        self._ids = {}
+        for name in names:
+            name_key = key(name)
+            if name_key not in PLACEHOLDER_NAMES and name_key not in self._ids:
+                self._ids[name_key] = len(self.names)
+                self.names.append(name)
+
+        ambiguous = set()
+        for alias, name in aliases:
+            alias_key, name_id = key(alias), self._ids.get(key(name))
+            if name_id is None or alias_key in ambiguous:
+                continue
+            current = self._ids.setdefault(alias_key, name_id)
+            if current != name_id:
+                ambiguous.add(alias_key)
+                del self._ids[alias_key]
+
+        self._suffixes = sorted(
+            (name_key[start:], name_id)
+            for name_key, name_id in self._ids.items()
+            for start in [0] + [m.end() for m in re.finditer(' ', name_key)]
+        )
+        postings = {}
+        for name_key, name_id in self._ids.items():
+            for gram in _trigrams(name_key):
+                postings.setdefault(gram, set()).add(name_id)
+        self._postings = {gram: np.fromiter(ids, dtype=np.int64) for gram, ids in postings.items()}
+        self._gram_counts = np.zeros(len(self.names), dtype=np.int64)
+        for name_id, name in enumerate(self.names):
+            self._gram_counts[name_id] = len(_trigrams(key(name)))
+
+    def __len__(self):
+        return len(self.names)
+
+    def id(self, name):
+        """Canonical ID of a name or alias, or None."""
+        return self._ids.get(key(name))
+
+    def canonical(self, name):
+        """Display name for a name or alias, or None."""
+        name_id = self.id(name)
+        return self.names[name_id] if name_id is not None else None
+
+    def ids(self, values):
+        """Canonical IDs for a column of names (nullable Int64; <NA> where unknown)."""
+        values = pd.Series(values)
+        unique = values.dropna().unique()
+        lookup = {value: self.id(value) for value in unique}
+        return values.map(lookup).astype('Int64')
+
+    def canonical_series(self, values):
+        """A column of names rewritten to display names, leaving unknown names unchanged."""
+        values = pd.Series(values)
+        lookup = {value: self.canonical(value) or value for value in values.dropna().unique()}
+        return values.map(lookup)
+
+    def complete(self, prefix, limit=10):
+        """Names with a word starting with `prefix`, in alphabetical order of the matching suffix."""
+        prefix = key(prefix)
+        start = bisect.bisect_left(self._suffixes, (prefix,))
+        found = {}
+        for suffix, name_id in self._suffixes[start:]:
+            if not suffix.startswith(prefix) or len(found) >= limit:
+                break
+            found.setdefault(name_id, self.names[name_id])
+        return list(found.values())
+
+    def search(self, query, limit=5, min_score=0.3):
+        """Closest names by trigram similarity (Dice coefficient), best first, as (name, score) pairs."""
+        grams = _trigrams(key(query))
+        hits = Counter()
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is not None:
+                hits.update(postings.tolist())
+        scored = [(2 * shared / (len(grams) + self._gram_counts[name_id]), name_id)
+                  for name_id, shared in hits.items()]
+        scored = sorted((item for item in scored if item[0] >= min_score), key=lambda item: (-item[0], item[1]))
+        return [(self.names[name_id], float(score)) for score, name_id in scored[:limit]]
+
+
+def _column_values(sources):
+    for path, columns in sources:
+        if not os.path.exists(path):
+            continue
+        df = data_schema.load(path)
+        for column in columns:
+            yield from df[column].dropna().astype(str).str.strip().unique()
+
+
+@lru_cache(maxsize=None)
+def player_index():
+    """The shared player index over every dataset's player columns."""
+    return NameIndex(_column_values(PLAYER_SOURCES))
+
+
+@lru_cache(maxsize=None)
+def venue_index():
+    """The shared venue index: every spelling in the datasets plus ground-only and "Ground, City" aliases."""
+    venues = [venue for venue in dict.fromkeys(_column_values(VENUE_SOURCES)) if venue not in VENUE_ALIASES]
+    spellings = [(venue, venue) for venue in venues] + list(VENUE_ALIASES.items())
+    aliases = list(VENUE_ALIASES.items())
+    aliases += [(alias, venue) for spelling, venue in spellings for alias in venue_aliases(spelling)]
+    return NameIndex(venues, aliases)
+
+
+def with_ids(df, player_column=None, venue_column=None):
+    """Copy of df with player_id / venue_id columns, so any two datasets join on the same IDs."""
+    df = df.copy()
+    if player_column is not None:
+        df['player_id'] = player_index().ids(df[player_column].astype(str).str.strip())
+    if venue_column is not None:
+        df['venue_id'] = venue_index().ids(df[venue_column].astype(str).str.strip())
+    return df
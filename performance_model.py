@@ -0,0 +1,355 @@
+import argparse
+import sys
+import time
+import tracemalloc
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder
+
+import data_schema
+import stats_store
+from stats_store import normalize
+
+DATA_FILE = 'cleaned_player_stats_in_venues_filled.csv'
+MODEL_FILE = 'batting_performance_model.joblib'
+
+NUMERIC_FEATURES = ['matches_played_bat', 'total_runs', 'batting_average']
+CATEGORICAL_FEATURES = ['Country_bat', 'Venue']
+TARGET = 'Performance_bat'
+
+# Joint batting + bowling model: one shared feature matrix, one classifier per target
+BOWLING_FEATURES = ['matches_played_bowl', 'total_runs_conceded', 'balls_bowled', 'economy', 'total_wickets',
+                    'Bowling_Strike_Rate']
+JOINT_TARGETS = {'bat': 'Performance_bat', 'bowl': 'Performance_bowl'}
+JOINT_MODEL_FILE = 'joint_performance_model.joblib'
+JOINT_PREDICTIONS_FILE = stats_store.PREDICTIONS_FILE
+
+# Stand-in for missing numeric stats (e.g. economy of a non-bowler)
+MISSING_VALUE = -1.0
+
+
+ENCODINGS = ('onehot', 'sparse', 'ordinal')
+
+
+def feature_layout(df, encoding='onehot', numeric=NUMERIC_FEATURES):
+    """Feature layout for an encoding.
+
+    'onehot' matches pd.get_dummies(..., drop_first=True) as a dense matrix,
+    'sparse' is the same columns as a CSR matrix, and 'ordinal' keeps one
+    integer-code column per categorical (codes follow the stored category
+    order, so new categories can be appended without retraining).
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown encoding '{encoding}'. Expected one of {ENCODINGS}")
+    categories = {column: sorted(df[column].dropna().astype(str).unique()) for column in CATEGORICAL_FEATURES}
+    names = list(numeric)
+    if encoding == 'ordinal':
+        names += CATEGORICAL_FEATURES
+    else:
+        categories = {column: values[1:] for column, values in categories.items()}
+        for column in CATEGORICAL_FEATURES:
+            names += [f'{column}_{value}' for value in categories[column]]
+    return {'encoding': encoding, 'numeric': list(numeric), 'categories': categories, 'feature_names': names}
+
+
+def extend_layout(layout, df):
+    """Append categories first seen in df to an ordinal layout (existing codes are unchanged)."""
+    if layout.get('encoding') != 'ordinal':
+        raise ValueError("Only ordinal layouts can grow; one-hot layouts have a fixed column set")
+    for column in CATEGORICAL_FEATURES:
+        known = set(layout['categories'][column])
+        layout['categories'][column] += sorted(set(df[column].dropna().astype(str)) - known)
+    return layout
+
+
+def encode(rows, layout):
+    """Feature matrix for any batch of rows using a stored layout (no get_dummies over the dataset).
+
+    Returns a dense array, or a CSR matrix for the 'sparse' encoding.
+    Category values unseen at training time (and the dropped first one-hot
+    category) encode as all zeros, or as code -1 in the ordinal encoding.
+    Missing numeric stats become MISSING_VALUE.
+    """
+    encoding = layout.get('encoding', 'onehot')
+    numeric = np.nan_to_num(rows[layout['numeric']].to_numpy(dtype=np.float64), nan=MISSING_VALUE)
+
+    if encoding == 'ordinal':
+        codes = [
+            rows[column].astype(str).map({value: i for i, value in enumerate(layout['categories'][column])})
+            .fillna(-1).to_numpy(dtype=np.float64)
+            for column in CATEGORICAL_FEATURES
+        ]
+        return np.column_stack([numeric] + codes)
+
+    hit_rows, hit_cols = [], []
+    offset = len(layout['numeric'])
+    for column in CATEGORICAL_FEATURES:
+        values = layout['categories'][column]
+        positions = {value: offset + i for i, value in enumerate(values)}
+        cols = rows[column].astype(str).map(positions).to_numpy(dtype=np.float64)
+        hit = ~np.isnan(cols)
+        hit_rows.append(np.flatnonzero(hit))
+        hit_cols.append(cols[hit].astype(np.int64))
+        offset += len(values)
+    hit_rows, hit_cols = np.concatenate(hit_rows), np.concatenate(hit_cols)
+
+    if encoding == 'sparse':
+        from scipy import sparse
+        numeric_rows, numeric_cols = np.nonzero(numeric)
+        return sparse.csr_matrix(
+            (np.concatenate([numeric[numeric_rows, numeric_cols], np.ones(len(hit_rows))]),
+             (np.concatenate([numeric_rows, hit_rows]), np.concatenate([numeric_cols, hit_cols]))),
+            shape=(len(rows), len(layout['feature_names'])))
+
+    X = np.zeros((len(rows), len(layout['feature_names'])), dtype=np.float64)
+    X[:, :len(layout['numeric'])] = numeric
+    X[hit_rows, hit_cols] = 1
+    return X
+
+
+def load_training_data(data_file=DATA_FILE):
+    # Strict: training refuses files with unparseable values or missing keys (see data_schema.py)
+    df = data_schema.load(data_file, strict=True)
+    return df.dropna(subset=[TARGET, 'batting_average'])
+
+
+# Peak RSS of the whole process so far in MB (ru_maxrss is bytes on macOS, KiB on Linux); None without `resource`
+def process_peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / 2 ** 20 if sys.platform == 'darwin' else maxrss / 2 ** 10
+
+
+class _ResourceMeter:
+    """Wall time and memory of a block: with trace=True, peak traced (Python/NumPy) allocations inside it.
+
+    Tracing slows tree fitting several-fold, so fits are not traced; for
+    them only the process peak RSS is known, which covers the whole process
+    lifetime. rss_growth_mb is how far the block raised that peak (0 when it
+    stayed below an earlier high-water mark).
+    """
+
+    def __init__(self, trace=False):
+        self.trace = trace
+        self.peak_traced_mb = None
+
+    def __enter__(self):
+        self._rss_before = process_peak_rss_mb()
+        if self.trace:
+            tracemalloc.start()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self._started
+        if self.trace:
+            self.peak_traced_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+        self.process_peak_rss_mb = process_peak_rss_mb()
+        self.rss_growth_mb = (self.process_peak_rss_mb - self._rss_before
+                              if self.process_peak_rss_mb is not None else None)
+        return False
+
+
+def train(df, test_size=0.2, random_state=42, encoding='onehot', n_jobs=None, **model_params):
+    """Fit the batting-performance classifier; returns (artifact, X, y, X_test, y_test).
+
+    The artifact holds everything prediction needs: the model, the label
+    encoder and the feature layout, plus 'stats' with the encode/fit wall
+    times and peak memory. n_jobs=-1 grows the trees on all cores. The
+    model is fitted on plain arrays, so predict with encode()d matrices.
+    """
+    with _ResourceMeter(trace=True) as encoding_meter:
+        layout = feature_layout(df, encoding)
+        X = encode(df, layout)
+    label_encoder = LabelEncoder()
+    y = label_encoder.fit_transform(df[TARGET].astype(str))
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=random_state)
+    model = RandomForestClassifier(random_state=random_state, n_jobs=n_jobs, **model_params)
+    with _ResourceMeter() as fit_meter:
+        model.fit(X_train, y_train)
+
+    artifact = {
+        'model': model,
+        'label_encoder': label_encoder,
+        'layout': layout,
+        'stats': {
+            'rows': len(df),
+            'encode_seconds': encoding_meter.seconds,
+            'fit_seconds': fit_meter.seconds,
+            'encode_peak_mb': encoding_meter.peak_traced_mb,
+            'process_peak_rss_mb': fit_meter.process_peak_rss_mb,
+            'fit_rss_growth_mb': fit_meter.rss_growth_mb,
+        },
+    }
+    return artifact, X, y, X_test, y_test
+
+
+def add_trees(artifact, df, n_trees, n_jobs=None, test_size=0.2, random_state=42):
+    """Warm-start: grow n_trees more trees on df (e.g. new venue data) and keep the existing ones.
+
+    The new trees fit the training part of the same split train() uses, so
+    on the original data the held-out rows stay unseen by every tree.
+    Returns (artifact, X, y, X_test, y_test) like train(). Ordinal layouts
+    absorb venues/countries first seen in df. The target classes must
+    already be known to the label encoder.
+    """
+    model, layout = artifact['model'], artifact['layout']
+    if layout.get('encoding') == 'ordinal':
+        extend_layout(layout, df)
+    X = encode(df, layout)
+    y = artifact['label_encoder'].transform(df[TARGET].astype(str))
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=random_state)
+
+    model.set_params(warm_start=True, n_estimators=model.n_estimators + n_trees, n_jobs=n_jobs)
+    with _ResourceMeter() as meter:
+        model.fit(X_train, y_train)
+    artifact['stats'].update(rows=len(df), fit_seconds=meter.seconds, process_peak_rss_mb=meter.process_peak_rss_mb,
+                             fit_rss_growth_mb=meter.rss_growth_mb)
+    return artifact, X, y, X_test, y_test
+
+
+def train_joint(df, test_size=0.2, random_state=42, encoding='ordinal', n_jobs=None, **model_params):
+    """Fit batting and bowling performance classifiers from one shared feature matrix.
+
+    The matrix (batting and bowling stats plus country/venue) is encoded in
+    a single pass over all rows; each model trains on the rows that have
+    its target. Returns (artifact, predictions) where predictions is the
+    joint table keyed by (Player, Venue).
+    """
+    with _ResourceMeter(trace=True) as encoding_meter:
+        layout = feature_layout(df, encoding, NUMERIC_FEATURES + BOWLING_FEATURES)
+        X = encode(df, layout)
+
+    models, label_encoders, accuracy = {}, {}, {}
+    fit_seconds = 0.0
+    for name, target in JOINT_TARGETS.items():
+        rows = np.flatnonzero(df[target].notna().to_numpy())
+        label_encoders[name] = LabelEncoder()
+        y = label_encoders[name].fit_transform(df[target].iloc[rows].astype(str))
+
+        train_rows, test_rows, y_train, y_test = train_test_split(rows, y, test_size=test_size,
+                                                                  random_state=random_state)
+        models[name] = RandomForestClassifier(random_state=random_state, n_jobs=n_jobs, **model_params)
+        with _ResourceMeter() as fit_meter:
+            models[name].fit(X[train_rows], y_train)
+        fit_seconds += fit_meter.seconds
+        accuracy[name] = float((models[name].predict(X[test_rows]) == y_test).mean())
+
+    artifact = {
+        'models': models,
+        'label_encoders': label_encoders,
+        'layout': layout,
+        'stats': {
+            'rows': len(df),
+            'encode_seconds': encoding_meter.seconds,
+            'encode_peak_mb': encoding_meter.peak_traced_mb,
+            'fit_seconds': fit_seconds,
+            'process_peak_rss_mb': fit_meter.process_peak_rss_mb,
+            'accuracy': accuracy,
+        },
+    }
+    return artifact, predict_joint(artifact, df, X)
+
+
+def predict_joint(artifact, rows, X=None):
+    """Joint prediction table for rows of venue stats.
+
+    Batting is predicted where the player has a batting average, bowling
+    where they have bowled a ball; other cells are left empty.
+    """
+    if X is None:
+        X = encode(rows, artifact['layout'])
+    masks = {
+        'bat': rows['batting_average'].notna().to_numpy(),
+        'bowl': (rows['balls_bowled'].fillna(0) > 0).to_numpy(),
+    }
+    table = pd.DataFrame({'Player': rows['Player_bat'].to_numpy(), 'Venue': rows['Venue'].to_numpy()})
+    for name, column in (('bat', 'Predicted Batting Performance'), ('bowl', 'Predicted Bowling Performance')):
+        labels = np.full(len(rows), None, dtype=object)
+        hit = np.flatnonzero(masks[name])
+        if hit.size:
+            predicted = artifact['models'][name].predict(X[hit])
+            labels[hit] = artifact['label_encoders'][name].inverse_transform(predicted)
+        table[column] = labels
+    return table
+
+
+def load_joint_predictions(path=JOINT_PREDICTIONS_FILE):
+    """The joint prediction table indexed like the stats store tables (see stats_store.load_predictions)."""
+    return stats_store.load_predictions(path)
+
+
+def save(artifact, path=MODEL_FILE):
+    joblib.dump(artifact, path)
+
+
+class Predictor:
+    """Loads a trained artifact once and scores (player, venue) batches.
+
+    Feature rows come from the venue stats table, indexed once by
+    (venue key, normalized player), where the venue key resolves aliases
+    as the stats store does (stats_store.venue_key); predictions are
+    memoized, so repeated squad lookups cost a dict hit.
+    """
+
+    def __init__(self, model_file=MODEL_FILE, data_file=DATA_FILE):
+        artifact = joblib.load(model_file)
+        self.model = artifact['model']
+        self.label_encoder = artifact['label_encoder']
+        self.layout = artifact['layout']
+
+        stats = data_schema.load(data_file)
+        stats = stats.dropna(subset=['batting_average'])
+        venues = stats['Venue'].astype(str)
+        venues = venues.map({venue: stats_store.venue_key(venue) for venue in venues.unique()})
+        keys = zip(venues, stats['Player_bat'].astype(str).map(normalize))
+        self._rows = {key: i for i, key in enumerate(keys)}
+        self._features = encode(stats, self.layout)
+        self._cache = {}
+
+    def predict(self, pairs):
+        """Predicted performance label for each (player, venue); None where there are no stats."""
+        pairs = list(pairs)
+        venues = {venue: stats_store.venue_key(venue) for venue in dict.fromkeys(venue for _, venue in pairs)}
+        keys = [(venues[venue], normalize(player)) for player, venue in pairs]
+        todo = [key for key in dict.fromkeys(keys) if key not in self._cache and key in self._rows]
+        if todo:
+            labels = self.label_encoder.inverse_transform(
+                self.model.predict(self._features[[self._rows[key] for key in todo]]))
+            self._cache.update(zip(todo, labels))
+        return [self._cache.get(key) for key in keys]
+
+    def predict_squad(self, squad, venue):
+        """{player: predicted performance} for a squad at one venue."""
+        return dict(zip(squad, self.predict([(player, venue) for player in squad])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Predict player batting performance at venues.")
+    parser.add_argument('--model', default=MODEL_FILE)
+    parser.add_argument('--data', default=DATA_FILE)
+    parser.add_argument('--venue', required=True)
+    parser.add_argument('players', nargs='+', help="Player names")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    predictor = Predictor(args.model, args.data)
+    loaded = time.perf_counter()
+    predictions = predictor.predict_squad(args.players, args.venue)
+    done = time.perf_counter()
+
+    for player, label in predictions.items():
+        print(f"{player}: {label if label is not None else 'N/A'}")
+    print(f"(loaded in {(loaded - started) * 1000:.1f} ms, predicted in {(done - loaded) * 1000:.2f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import argparse
+import html
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+import data_schema
+import name_index
+import stats_store
+
+CAREER_FILE = 'final_cricket_stats_fixed.csv'
+PREDICTIONS_FILE = stats_store.PREDICTIONS_FILE
+# Batting-only predictions from plain 'train1.py', read when the joint table is absent
+BATTING_PREDICTIONS_FILE = 'player_venue_predicted_performance.csv'
+PREDICTION_COLUMNS = ['Predicted Batting Performance', 'Predicted Bowling Performance']
+REPORT_DIR = 'player_reports'
+FORMATS = ('json', 'csv', 'html')
+
+# Players formatted and written per batch; bounds the memory held by formatted output
+BATCH_PLAYERS = 50
+
+VENUE_COLUMNS = ['Venue', 'matches_played_bat', 'total_runs', 'batting_average', 'Performance_bat',
+                 'matches_played_bowl', 'total_runs_conceded', 'balls_bowled', 'economy', 'total_wickets',
+                 'Bowling_Strike_Rate', 'Performance_bowl'] + PREDICTION_COLUMNS
+
+# (label, column) pairs of the per-venue text block printed by player_stats.py
+TEXT_FIELDS = [
+    ('Country', 'Country_bat'),
+    ('Matches Played (Bat)', 'matches_played_bat'),
+    ('Total Runs', 'total_runs'),
+    ('Batting Average', 'batting_average'),
+    ('Batting Performance', 'Performance_bat'),
+    ('Matches Played (Bowl)', 'matches_played_bowl'),
+    ('Runs Conceded', 'total_runs_conceded'),
+    ('Balls Bowled', 'balls_bowled'),
+    ('Economy', 'economy'),
+    ('Total Wickets', 'total_wickets'),
+    ('Bowling Strike Rate', 'Bowling_Strike_Rate'),
+    ('Bowling Performance', 'Performance_bowl'),
+]
+
+
+def text_block(rows):
+    """The player_stats.py text for every row at once, each venue record followed by a separator line."""
+    if rows.empty:
+        return ''
+    lines = [f'{label}: ' + rows[column].astype(object).map(str) for label, column in TEXT_FIELDS]
+    records = lines[0].str.cat(lines[1:], sep='\n')
+    return '\n'.join(records + '\n' + '-' * 40)
+
+
+# The joint prediction table, or the batting-only one (no bowling predictions) when it has not been trained
+def _load_predictions(predictions_file):
+    if os.path.exists(predictions_file) or predictions_file != PREDICTIONS_FILE:
+        return data_schema.load(predictions_file)
+    predictions = data_schema.load(BATTING_PREDICTIONS_FILE)
+    return predictions.rename(columns={'Predicted Performance': PREDICTION_COLUMNS[0]}).assign(**{
+        PREDICTION_COLUMNS[1]: None})
+
+
+def load_profiles(players_file=stats_store.PLAYERS_FILE, career_file=CAREER_FILE,
+                  predictions_file=PREDICTIONS_FILE):
+    """(venue rows, career rows) joined on canonical player/venue IDs and sorted by player.
+
+    Venue rows carry the predicted batting and bowling performance for
+    their (player, venue); career rows are one per player, indexed by player_id.
+    """
+    venues = name_index.with_ids(data_schema.load(players_file), 'Player_bat', 'Venue')
+    predictions = name_index.with_ids(_load_predictions(predictions_file), 'Player', 'Venue')
+    predictions = predictions.dropna(subset=['player_id', 'venue_id']).drop_duplicates(['player_id', 'venue_id'])
+    venues = venues.merge(predictions[['player_id', 'venue_id'] + PREDICTION_COLUMNS],
+                          on=['player_id', 'venue_id'], how='left')
+    venues = venues.dropna(subset=['player_id']).sort_values(['player_id', 'Venue'], kind='stable')
+
+    career = name_index.with_ids(data_schema.load(career_file), 'Player')
+    career = career.dropna(subset=['player_id']).drop_duplicates('player_id').set_index('player_id')
+    return venues.reset_index(drop=True), career
+
+
+def _slug(name):
+    return re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_')
+
+
+# One JSON object per row, formatted for the whole frame in one call
+def _json_rows(frame):
+    return frame.to_json(orient='records', lines=True).splitlines() if len(frame) else []
+
+
+def _csv_rows(frame):
+    return frame.to_csv(index=False, header=False).splitlines() if len(frame) else []
+
+
+def _html_rows(frame):
+    text = frame.astype(object).where(frame.notna(), '')
+    cells = [('<td>' + text[column].map(str).map(html.escape) + '</td>') for column in frame.columns]
+    return list(cells[0].str.cat(cells[1:]).radd('<tr>') + '</tr>') if len(frame) else []
+
+
+ROW_FORMATTERS = {'json': _json_rows, 'csv': _csv_rows, 'html': _html_rows}
+
+
+def _html_page(player, country, career_header, career_row, venue_header, venue_rows):
+    head = lambda columns: '<tr>' + ''.join(f'<th>{html.escape(c)}</th>' for c in columns) + '</tr>'
+    return (f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{html.escape(player)}</title></head><body>\n'
+            f'<h1>{html.escape(player)}</h1>\n<p>Country: {html.escape(country)}</p>\n'
+            f'<h2>Career</h2>\n<table>{head(career_header)}{career_row}</table>\n'
+            f'<h2>By venue</h2>\n<table>{head(venue_header)}\n' + '\n'.join(venue_rows) + '\n</table>\n'
+            '</body></html>\n')
+
+
+def write_reports(venues, career, output_dir=REPORT_DIR, formats=FORMATS, batch_players=BATCH_PLAYERS):
+    """Write every player's report files in one pass over the player-sorted venue rows.
+
+    Rows are formatted a batch of players at a time (vectorized per
+    column) and each player's files are written as soon as they are ready.
+    Returns an index DataFrame of players and their file stem.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    player_ids = venues['player_id'].to_numpy(dtype=np.int64)
+    starts = np.concatenate([[0], np.flatnonzero(player_ids[1:] != player_ids[:-1]) + 1])
+    ends = np.append(starts[1:], len(venues))
+    career_columns = [column for column in career.columns if column not in ('Player', 'player_id')]
+    players = name_index.player_index()
+    written = []
+
+    for first in range(0, len(starts), batch_players):
+        lo, hi = starts[first], ends[min(first + batch_players, len(starts)) - 1]
+        batch = venues.iloc[lo:hi][VENUE_COLUMNS]
+        ids = player_ids[starts[first:first + batch_players]]
+        batch_career = career.reindex(ids)[career_columns]
+
+        rows = {fmt: ROW_FORMATTERS[fmt](batch) for fmt in formats}
+        career_rows = {fmt: ROW_FORMATTERS[fmt](batch_career) for fmt in formats if fmt != 'csv'}
+        countries = venues['Country_bat'].iloc[starts[first:first + batch_players]].astype(str).tolist()
+
+        for k, player_id in enumerate(ids):
+            start, end = starts[first + k] - lo, ends[first + k] - lo
+            player = players.names[player_id]
+            stem = os.path.join(output_dir, f'{player_id:04d}_{_slug(player)}')
+            if 'json' in formats:
+                with open(stem + '.json', 'w', encoding='utf-8') as f:
+                    f.write(f'{{"player": {json.dumps(player)}, "country": {json.dumps(countries[k])}, '
+                            f'"career": {career_rows["json"][k]}, '
+                            f'"venues": [{",".join(rows["json"][start:end])}]}}\n')
+            if 'csv' in formats:
+                with open(stem + '.csv', 'w', encoding='utf-8', newline='') as f:
+                    f.write(','.join(VENUE_COLUMNS) + '\n' + '\n'.join(rows['csv'][start:end]) + '\n')
+            if 'html' in formats:
+                with open(stem + '.html', 'w', encoding='utf-8') as f:
+                    f.write(_html_page(player, countries[k], career_columns, career_rows['html'][k],
+                                       VENUE_COLUMNS, rows['html'][start:end]))
+            written.append({'player_id': int(player_id), 'player': player, 'venues': int(end - start),
+                            'file': os.path.basename(stem)})
+
+    index = pd.DataFrame(written)
+    index.to_csv(os.path.join(output_dir, 'index.csv'), index=False)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a profile report for every player at every venue.")
+    parser.add_argument('-o', '--output-dir', default=REPORT_DIR)
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS))
+    parser.add_argument('--batch-players', type=int, default=BATCH_PLAYERS)
+    parser.add_argument('--players-file', default=stats_store.PLAYERS_FILE)
+    parser.add_argument('--career-file', default=CAREER_FILE)
+    parser.add_argument('--predictions-file', default=PREDICTIONS_FILE)
+    args = parser.parse_args()
+
+    venues, career = load_profiles(args.players_file, args.career_file, args.predictions_file)
+    index = write_reports(venues, career, args.output_dir, args.formats, args.batch_players)
+    print(f"Wrote reports for {len(index)} players ({len(venues)} venue records) to {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -1,62 +1,58 @@
-import pandas as pd
+import name_index
+import player_report
+import stats_store
 
-# Load dataset
-df = pd.read_csv('player_stats_in_venues.csv')
 
-# Ask for the venue
-venue = input("Enter the venue name: ").strip()
+# Ask until the answer resolves to a known name, offering fuzzy suggestions; None to give up
+def resolve(index, prompt, allowed=None):
+    while True:
+        text = input(prompt).strip()
+        if text.lower() == 'exit':
+            return None
+        name = index.canonical(text)
+        if name is not None and (allowed is None or name in allowed):
+            return name
+
+        # Word-prefix completions first, then the closest spellings
+        candidates = index.complete(text, 20) + [match for match, _ in index.search(text, 20)]
+        suggestions = [c for c in dict.fromkeys(candidates) if allowed is None or c in allowed][:10]
+        if not suggestions:
+            print("No similar names found. Try again.")
+            continue
+        print(f"\nNo exact match found for '{text}'. Did you mean:")
+        for idx, suggestion in enumerate(suggestions, 1):
+            print(f"  {idx}. {suggestion}")
+        choice = input("Enter the number you meant, or press Enter to try again: ").strip()
+        if choice.isdigit() and 1 <= int(choice) <= len(suggestions):
+            return suggestions[int(choice) - 1]
+        print("Try again.")
+
+
+# Load dataset (indexed by venue and player)
+df = stats_store.get_store().venue_stats
+
+# Ask for the venue ("Wankhede Stadium" and "wankhede stadium, mumbai" both resolve)
+venue = resolve(name_index.venue_index(), "Enter the venue name: ")
 
 # Filter data for the selected venue
-venue_data = df[df['Venue'].str.lower() == venue.lower()]
+venue_data = stats_store.venue_rows(df, venue) if venue else df.iloc[:0]
 
 if venue_data.empty:
     print("No data available for this venue.")
 else:
-    players_in_venue = venue_data['Player_bat'].unique()
+    players_in_venue = set(venue_data['Player_bat'])
 
     while True:
-        player_input = input("\nEnter player name (or type 'exit' to quit): ").strip()
-        if player_input.lower() == 'exit':
+        selected_player = resolve(name_index.player_index(), "\nEnter player name (or type 'exit' to quit): ",
+                                  players_in_venue)
+        if selected_player is None:
             break
 
-        matched_players = [p for p in players_in_venue if p.lower() == player_input.lower()]
-
-        if not matched_players:
-            suggestions = [p for p in players_in_venue if player_input.lower() in p.lower()]
-            if suggestions:
-                print(f"\nNo exact match found for '{player_input}'. Did you mean:")
-                for idx, name in enumerate(suggestions, 1):
-                    print(f"  {idx}. {name}")
-                choice = input("Enter the number of the player you meant, or press Enter to try again: ").strip()
-                if choice.isdigit() and 1 <= int(choice) <= len(suggestions):
-                    selected_player = suggestions[int(choice) - 1]
-                else:
-                    print("Try again.")
-                    continue
-            else:
-                print("No similar player names found. Try again.")
-                continue
-        else:
-            selected_player = matched_players[0]
-
         # Get player data for venue
-        player_data = venue_data[venue_data['Player_bat'].str.lower() == selected_player.lower()]
+        player_data = stats_store.player_rows(venue_data, selected_player, venue)
 
         print(f"\n📍 Venue: {venue}")
         print(f"👤 Player: {selected_player}")
         print("-" * 40)
 
-        for _, row in player_data.iterrows():
-            print(f"Country: {row['Country_bat']}")
-            print(f"Matches Played (Bat): {row['matches_played_bat']}")
-            print(f"Total Runs: {row['total_runs']}")
-            print(f"Batting Average: {row['batting_average']}")
-            print(f"Batting Performance: {row['Performance_bat']}")
-            print(f"Matches Played (Bowl): {row['matches_played_bowl']}")
-            print(f"Runs Conceded: {row['total_runs_conceded']}")
-            print(f"Balls Bowled: {row['balls_bowled']}")
-            print(f"Economy: {row['economy']}")
-            print(f"Total Wickets: {row['total_wickets']}")
-            print(f"Bowling Strike Rate: {row['Bowling_Strike_Rate']}")
-            print(f"Bowling Performance: {row['Performance_bowl']}")
-            print("-" * 40)
+        print(player_report.text_block(player_data))
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+# Weights of the linear player score (see ts2.evaluate_player); economy counts as (100 - economy)
+SCORE_WEIGHTS = {
+    'total_runs': 1.5,
+    'batting_average': 2,
+    'total_wickets': 3,
+    'economy': -1.5,
+}
+SCORE_OFFSET = 100 * 1.5
+
+# Bonus for the model's predicted performance at the venue (stats_store attaches it from the joint table);
+# players without a prediction score on raw stats alone
+PREDICTION_COLUMN = 'Predicted Performance'
+PREDICTION_BONUS = {'Excellent': 20, 'Good': 10, 'Average': 0, 'Poor': -10, 'Bad': -20}
+SCORE_COLUMNS = list(SCORE_WEIGHTS) + [PREDICTION_COLUMN]
+
+
+def score_record(player):
+    """Score a single player dict; missing stats and predictions count as 0."""
+    return (sum(player.get(column, 0) * weight for column, weight in SCORE_WEIGHTS.items()) + SCORE_OFFSET
+            + PREDICTION_BONUS.get(player.get(PREDICTION_COLUMN), 0))
+
+
+def player_scores(players):
+    """Score every row of a DataFrame (or list of player dicts) at once; NaN stats count as 0."""
+    if not isinstance(players, pd.DataFrame):
+        players = pd.DataFrame(list(players))
+
+    scores = np.full(len(players), SCORE_OFFSET, dtype=np.float64)
+    for column, weight in SCORE_WEIGHTS.items():
+        if column in players.columns:
+            scores += pd.to_numeric(players[column], errors='coerce').fillna(0).to_numpy(dtype=np.float64) * weight
+    if PREDICTION_COLUMN in players.columns:
+        scores += players[PREDICTION_COLUMN].astype(object).map(PREDICTION_BONUS).fillna(0).to_numpy(dtype=np.float64)
+    return scores
+
+
+def team_fitness(population, scores):
+    """Gather-and-sum fitness for a (P, team_size) array of player IDs (or a single team)."""
+    return np.asarray(scores)[population].sum(axis=-1)
+
+
+def elite_indices(fitness, count):
+    """Indices of the `count` fittest teams, best first."""
+    return np.argsort(-fitness, kind='stable')[:count]
+
+
+def tournament_select(fitness, count, rng, size=3):
+    """Pick `count` parent indices, each the fittest of `size` randomly drawn teams."""
+    entrants = rng.integers(0, len(fitness), size=(count, size))
+    winners = np.argmax(fitness[entrants], axis=1)
+    return entrants[np.arange(count), winners]
+
+
+def truncation_select(fitness, count, rng, survivors):
+    """Pick `count` parent indices uniformly from the `survivors` fittest teams."""
+    pool = elite_indices(fitness, survivors)
+    return pool[rng.integers(0, len(pool), size=count)]
+
+
+class PlateauStopper:
+    """Signals early stopping once the best fitness has not improved for `patience` generations."""
+
+    def __init__(self, patience=None, tol=1e-9):
+        self.patience = patience
+        self.tol = tol
+        self.best = -np.inf
+        self.stale = 0
+
+    def update(self, best):
+        if best > self.best + self.tol:
+            self.best = best
+            self.stale = 0
+        else:
+            self.stale += 1
+        return self.patience is not None and self.stale >= self.patience
@@ -0,0 +1,251 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import matchups
+import performance_model
+import selector_api
+import stats_store
+
+MAX_BODY = 1 << 20
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# Pool initializer: load the stats store into every worker before the first job arrives
+def _warm_worker(batter_file, bowler_file, players_file):
+    stats_store.get_store(batter_file, bowler_file, players_file)
+
+
+# Matchup rates for JSON: NaN (no balls faced) becomes null
+def _rates(strike_rate, dismissal_rate):
+    return {'strike_rate': None if math.isnan(strike_rate) else strike_rate,
+            'dismissal_rate': None if math.isnan(dismissal_rate) else dismissal_rate}
+
+
+# A list of names, or one comma-separated string, as stripped non-empty names
+def _names(value, field):
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, list) or not all(isinstance(name, str) for name in value):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{field}' must be a list of names or a comma-separated string")
+    return [name.strip() for name in value if name.strip()]
+
+
+def _venue(body):
+    venue = body.get('venue')
+    if venue is not None and not isinstance(venue, str):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "'venue' must be a string")
+    return venue.strip() if venue else venue
+
+
+def _select_job(squad, venue, strategy, seed, files):
+    return selector_api.select_xi(squad, venue, strategy, seed, *files)
+
+
+class SelectionService:
+    """Selection, prediction and matchup endpoints over warm in-memory data.
+
+    The stats store, matchup engine and trained model are loaded once at
+    start-up; GA selections run in a process pool whose workers each hold
+    the stats store. Concurrent /select requests for the same squad, venue,
+    strategy and seed share one computation.
+    """
+
+    def __init__(self, workers=None, model_file=performance_model.MODEL_FILE, matchup_file=matchups.MATCHUP_FILE,
+                 batter_file=stats_store.BATTER_FILE, bowler_file=stats_store.BOWLER_FILE,
+                 players_file=stats_store.PLAYERS_FILE):
+        self.files = (batter_file, bowler_file, players_file)
+        self.store = stats_store.get_store(*self.files)
+        self.matchups = matchups.MatchupEngine(matchup_file)
+        self.predictor = performance_model.Predictor(model_file, players_file) if os.path.exists(model_file) else None
+
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker, initargs=self.files)
+        # Model prediction and lookups are short; one thread keeps the shared caches single-writer
+        self.lookups = ThreadPoolExecutor(max_workers=1)
+        self._inflight = {}
+        self.stats = {'requests': 0, 'selections_computed': 0, 'selections_coalesced': 0}
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+        self.lookups.shutdown()
+
+    async def _coalesced(self, key, start):
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(start())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+            self.stats['selections_computed'] += 1
+        else:
+            self.stats['selections_coalesced'] += 1
+        # Shielded so one client disconnecting does not cancel the others' result
+        return await asyncio.shield(future)
+
+    async def select(self, body):
+        squad = _names(body.get('squad', []), 'squad')
+        venue = _venue(body)
+        if not squad or not venue:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'squad' and 'venue' are required")
+        strategy = body.get('strategy', 'team_selector')
+        if not isinstance(strategy, str) or strategy not in selector_api.STRATEGIES:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unknown strategy '{strategy}'")
+        seed = body.get('seed', 42)
+        if isinstance(seed, bool) or not isinstance(seed, (int, str)):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'seed' must be an integer")
+        try:
+            seed = int(seed)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'seed' must be an integer")
+
+        key = (tuple(sorted({stats_store.normalize(player) for player in squad})),
+               stats_store.normalize(venue), strategy, seed)
+        loop = asyncio.get_running_loop()
+        result = await self._coalesced(key, lambda: loop.run_in_executor(
+            self.pool, _select_job, squad, venue, strategy, seed, self.files))
+
+        attack = _names(body.get('attack', []), 'attack')
+        if attack and result['found']:
+            strike_rate, dismissal_rate = self.matchups.expected(result['playing_xi'], attack)
+            result = {**result, 'matchup': _rates(strike_rate, dismissal_rate)}
+        return result
+
+    async def predict(self, body):
+        if self.predictor is None:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "No trained model; run train1.py first")
+        squad, venue = _names(body.get('squad', []), 'squad'), _venue(body)
+        if not squad or not venue:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'squad' and 'venue' are required")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.lookups, self.predictor.predict_squad, squad, venue)
+
+    async def matchup(self, body):
+        batters, attack = _names(body.get('batters', []), 'batters'), _names(body.get('bowlers', []), 'bowlers')
+        if not batters or not attack:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'batters' and 'bowlers' are required")
+        strike_rate, dismissal_rate = self.matchups.expected(batters, attack)
+        return _rates(strike_rate, dismissal_rate)
+
+    async def player(self, query):
+        name = query.get('name', [None])[0]
+        if not name:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'name' is required")
+        venue = query.get('venue', [None])[0]
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.lookups, selector_api.player_stats, name, venue, *self.files)
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        routes = {
+            ('GET', '/health'): lambda: self.health(),
+            ('GET', '/stats'): lambda: self.service_stats(),
+            ('GET', '/player'): lambda: self.player(parse_qs(url.query)),
+            ('POST', '/select'): lambda: self.select(body),
+            ('POST', '/predict'): lambda: self.predict(body),
+            ('POST', '/matchup'): lambda: self.matchup(body),
+        }
+        handler = routes.get((method, url.path))
+        if handler is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {method} {url.path}")
+        return await handler()
+
+    async def health(self):
+        return {'status': 'ok', 'model_loaded': self.predictor is not None}
+
+    async def service_stats(self):
+        return {**self.stats, 'in_flight': len(self._inflight)}
+
+    async def handle(self, reader, writer):
+        self.stats['requests'] += 1
+        try:
+            status, payload = HTTPStatus.OK, await self._respond(reader)
+        except HTTPError as e:
+            status, payload = e.status, {'error': str(e)}
+        except Exception as e:
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"{type(e).__name__}: {e}"}
+
+        data = json.dumps(payload).encode()
+        writer.write(f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                     f"Connection: close\r\n\r\n".encode() + data)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _respond(self, reader):
+        request_line = (await reader.readline()).decode('latin-1').split()
+        if len(request_line) != 3:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+        method, target, _ = request_line
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Content-Length must be an integer")
+        if length < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Content-Length must not be negative")
+        if length > MAX_BODY:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        body = {}
+        if length:
+            try:
+                data = await reader.readexactly(length)
+            except asyncio.IncompleteReadError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Request body shorter than Content-Length")
+            try:
+                body = json.loads(data)
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be JSON")
+            if not isinstance(body, dict):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+        return await self.dispatch(method, target, body)
+
+
+async def serve(service, host, port):
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Serving on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP service for team selection and performance prediction.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=None, help="GA worker processes (default: CPU count)")
+    parser.add_argument('--model', default=performance_model.MODEL_FILE)
+    parser.add_argument('--matchup-file', default=matchups.MATCHUP_FILE)
+    parser.add_argument('--batter-file', default=stats_store.BATTER_FILE)
+    parser.add_argument('--bowler-file', default=stats_store.BOWLER_FILE)
+    parser.add_argument('--players-file', default=stats_store.PLAYERS_FILE)
+    args = parser.parse_args()
+
+    service = SelectionService(args.workers, args.model, args.matchup_file,
+                               args.batter_file, args.bowler_file, args.players_file)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import json
+import sys
+
+import numpy as np
+
+import batch_select
+import stats_store
+
+STRATEGIES = batch_select.STRATEGIES
+
+PLAYER_COLUMNS = ['Player_bat', 'Country_bat', 'Venue', 'matches_played_bat', 'total_runs', 'batting_average',
+                  'Performance_bat', 'matches_played_bowl', 'total_runs_conceded', 'balls_bowled', 'economy',
+                  'total_wickets', 'Bowling_Strike_Rate', 'Performance_bowl']
+
+
+# numpy scalars and NaN -> plain JSON values
+def _plain(value):
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def select_xi(squad, venue, strategy='team_selector', seed=42, batter_file=stats_store.BATTER_FILE,
+              bowler_file=stats_store.BOWLER_FILE, players_file=stats_store.PLAYERS_FILE):
+    """Select a playing XI plus 12th man for the squad at the venue, without prompts.
+
+    The stats tables are loaded on the first call and reused for every later
+    call in the process (see stats_store.get_store). Returns a JSON-ready dict
+    with the playing_xi (batters first), twelfth_man, the team's summed player
+    score and found=False when the squad has too few players with stats there.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}'. Expected one of {STRATEGIES}")
+    squad = [player.strip() for player in squad if player.strip()]
+    venue = venue.strip()
+
+    # The whole store tables are passed (selection slices the venue itself) so per-table caches
+    # such as the greedy leaderboards are built once per process, not once per request
+    store = stats_store.get_store(batter_file, bowler_file, players_file)
+    team = batch_select.select_xii(store.batters, store.bowlers, squad, venue, strategy, seed)
+    fitness = batch_select.team_fitness(store.batters, store.bowlers, squad, venue, team)
+
+    return {
+        'venue': venue,
+        'strategy': strategy,
+        'found': bool(team),
+        'playing_xi': team[:11],
+        'twelfth_man': team[11] if len(team) > 11 else None,
+        'fitness': _plain(fitness),
+    }
+
+
+def player_stats(player, venue=None, batter_file=stats_store.BATTER_FILE, bowler_file=stats_store.BOWLER_FILE,
+                 players_file=stats_store.PLAYERS_FILE):
+    """A player's venue records (one dict per venue, or just the given venue) from the combined stats table."""
+    venue_stats = stats_store.get_store(batter_file, bowler_file, players_file).venue_stats
+    if venue is not None:
+        rows = stats_store.player_rows(venue_stats, player, venue)
+    else:
+        rows = venue_stats[venue_stats.index.get_level_values('player_key') == stats_store.normalize(player)]
+    return [{column: _plain(value) for column, value in zip(PLAYER_COLUMNS, values)}
+            for values in rows[PLAYER_COLUMNS].itertuples(index=False, name=None)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Select a playing XI or look up player stats, printing JSON.")
+    parser.add_argument('--batter-file', default=stats_store.BATTER_FILE)
+    parser.add_argument('--bowler-file', default=stats_store.BOWLER_FILE)
+    parser.add_argument('--players-file', default=stats_store.PLAYERS_FILE)
+    parser.add_argument('-o', '--output', help="Write the JSON here instead of stdout")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    select = commands.add_parser('select', help="Select a playing XI and 12th man")
+    select.add_argument('--squad', required=True, help="Comma-separated squad player names")
+    select.add_argument('--venue', required=True)
+    select.add_argument('--strategy', choices=STRATEGIES, default='team_selector')
+    select.add_argument('--seed', type=int, default=42)
+
+    player = commands.add_parser('player', help="A player's stats at one or every venue")
+    player.add_argument('name')
+    player.add_argument('--venue')
+    args = parser.parse_args()
+
+    if args.command == 'select':
+        result = select_xi(args.squad.split(','), args.venue, args.strategy, args.seed,
+                           args.batter_file, args.bowler_file, args.players_file)
+    else:
+        result = player_stats(args.name, args.venue, args.batter_file, args.bowler_file, args.players_file)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    else:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+
+if __name__ == "__main__":
+    main()
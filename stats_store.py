@@ -0,0 +1,167 @@
+import hashlib
+import os
+from functools import lru_cache
+
+import pandas as pd
+
+import data_cache
+import data_schema
+import name_index
+
+BATTER_FILE = 'updated_batter_stats.csv'
+BOWLER_FILE = 'final_bowler_stats_with_NA.csv'
+PLAYERS_FILE = 'cleaned_player_stats_in_venues_filled.csv'
+# Joint batting/bowling predictions written by 'train1.py --joint'; optional
+PREDICTIONS_FILE = 'player_venue_joint_predictions.csv'
+
+INDEX_NAMES = ['venue_key', 'player_key']
+
+# DataFrame.attrs entry naming the source files' content hash; pandas carries it onto slices of the tables
+SOURCE_ATTR = 'source_hash'
+
+
+def normalize(name):
+    """Canonical lookup key for a player or venue name: trimmed, single-spaced, lowercase."""
+    return ' '.join(str(name).split()).lower()
+
+
+def normalize_series(values):
+    return values.astype(str).str.replace(r'\s+', ' ', regex=True).str.strip().str.lower()
+
+
+# Attach a sorted (venue_key, player_key) MultiIndex so venue/player lookups are index slices
+def index_table(df, venue_column, player_column):
+    df.index = pd.MultiIndex.from_arrays(
+        [normalize_series(df[venue_column]), normalize_series(df[player_column])], names=INDEX_NAMES)
+    return df.sort_index()
+
+
+def _is_indexed(frame):
+    return isinstance(frame.index, pd.MultiIndex) and list(frame.index.names) == INDEX_NAMES
+
+
+# Index key of a venue, resolving aliases ("Wankhede Stadium") to the spelling the store uses
+def venue_key(venue):
+    return normalize(name_index.venue_index().canonical(venue) or venue)
+
+
+def venue_keys(frame):
+    """Venue key of every row, from the index of store tables or the Venue column of plain frames."""
+    if _is_indexed(frame):
+        return frame.index.get_level_values('venue_key').to_numpy()
+    return normalize_series(frame['Venue']).to_numpy()
+
+
+def venue_rows(frame, venue):
+    """All rows of a store table for one venue (sorted-index slice)."""
+    if not _is_indexed(frame):
+        return frame[normalize_series(frame['Venue']) == normalize(venue)]
+    key = venue_key(venue)
+    try:
+        return frame.xs(key, level='venue_key', drop_level=False)
+    except KeyError:
+        return frame.iloc[:0]
+
+
+def venue_size(frame, venue):
+    """Number of rows venue_rows would return, without slicing them out."""
+    if not _is_indexed(frame):
+        return int((normalize_series(frame['Venue']) == normalize(venue)).sum())
+    start, stop = frame.index.slice_locs((venue_key(venue),), (venue_key(venue),))
+    return stop - start
+
+
+def select(frame, squad, venue):
+    """Rows of a store table for the squad's players at one venue.
+
+    Tables built by StatsStore are sliced by their sorted index; plain
+    frames with Player/Venue columns fall back to a boolean mask.
+    """
+    if not _is_indexed(frame):
+        return frame[(frame['Player'].isin(squad)) & (frame['Venue'] == venue)]
+    at_venue = venue_rows(frame, venue)
+    keys = {normalize(player) for player in squad}
+    return at_venue[at_venue.index.get_level_values('player_key').isin(keys)]
+
+
+def player_rows(frame, player, venue):
+    """Rows of a store table for one player at one venue (hash lookup)."""
+    key = (venue_key(venue), normalize(player))
+    if key not in frame.index:
+        return frame.iloc[:0]
+    return frame.loc[[key]]
+
+
+def load_predictions(path=PREDICTIONS_FILE):
+    """The joint prediction table indexed by (venue key, player key), one row per pair; None if the file is absent."""
+    if not os.path.exists(path):
+        return None
+    predictions = data_schema.load(path)
+    predictions['Venue'] = name_index.venue_index().canonical_series(predictions['Venue'].astype(str).str.strip())
+    predictions = index_table(predictions, 'Venue', 'Player')
+    return predictions[~predictions.index.duplicated()]
+
+
+def source_hash(*paths):
+    """Content hash of a set of source files (absent files count as empty), as data_cache hashes them."""
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update((data_cache.file_hash(path) if os.path.exists(path) else '').encode())
+    return digest.hexdigest()
+
+
+class StatsStore:
+    """The per-venue batter, bowler and combined player tables, loaded once and indexed by (venue, player).
+
+    batters and bowlers use the selector schema (Player, Venue, Country, ...)
+    plus 'Predicted Performance' from the joint prediction table (batting
+    and bowling respectively; NaN where it has no row or the file is
+    absent, so scoring falls back to the raw stats). venue_stats is
+    cleaned_player_stats_in_venues_filled.csv as is. Venue spellings are
+    unified through name_index, so every table uses one name per ground.
+    Every table carries the hash of the files it was built from in
+    attrs[SOURCE_ATTR], which derived caches (leaderboards) key on.
+    """
+
+    def __init__(self, batter_file=BATTER_FILE, bowler_file=BOWLER_FILE, players_file=PLAYERS_FILE,
+                 predictions_file=PREDICTIONS_FILE):
+        venue_stats = data_schema.load(players_file)
+        venues = name_index.venue_index()
+        venue_stats['Venue'] = venues.canonical_series(venue_stats['Venue'].astype(str).str.strip())
+        country = venue_stats.drop_duplicates('Player_bat').set_index('Player_bat')['Country_bat']
+
+        batters = data_schema.load(batter_file).rename(columns={'batter': 'Player', 'venue': 'Venue'})
+        bowlers = data_schema.load(bowler_file).rename(columns={'bowler': 'Player', 'venue': 'Venue'})
+        for df in (batters, bowlers):
+            df['Venue'] = venues.canonical_series(df['Venue'].astype(str).str.strip())
+            df['Country'] = df['Player'].astype(str).map(country).fillna('India')
+
+        self.batters = index_table(batters, 'Venue', 'Player')
+        self.bowlers = index_table(bowlers, 'Venue', 'Player')
+        self.venue_stats = index_table(venue_stats, 'Venue', 'Player_bat')
+
+        predictions = load_predictions(predictions_file)
+        for table, column in ((self.batters, 'Predicted Batting Performance'),
+                              (self.bowlers, 'Predicted Bowling Performance')):
+            table['Predicted Performance'] = (predictions[column].astype(object).reindex(table.index).to_numpy()
+                                              if predictions is not None else None)
+
+        self.source_hash = source_hash(batter_file, bowler_file, players_file, predictions_file)
+        for table in (self.batters, self.bowlers, self.venue_stats):
+            table.attrs[SOURCE_ATTR] = self.source_hash
+
+    def select(self, squad, venue):
+        """(batters, bowlers) rows for the squad at the venue."""
+        return select(self.batters, squad, venue), select(self.bowlers, squad, venue)
+
+
+def get_store(batter_file=BATTER_FILE, bowler_file=BOWLER_FILE, players_file=PLAYERS_FILE,
+              predictions_file=PREDICTIONS_FILE):
+    """Process-wide StatsStore, loaded on first use for each set of files."""
+    return _cached_store(batter_file, bowler_file, players_file, predictions_file)
+
+
+# Keyed on all four paths so positional, keyword and default calls share one store
+@lru_cache(maxsize=None)
+def _cached_store(batter_file, bowler_file, players_file, predictions_file):
+    return StatsStore(batter_file, bowler_file, players_file, predictions_file)
@@ -1,21 +1,26 @@
 import pandas as pd
+import numpy as np
 import random
 import os
 
-random.seed(42)
+import ga_engine
+import instrumentation
+import stats_store
+import vulnerability
 
 # Load data from CSV files
 def load_data():
-    batter_file = r"D:\Cricket Project\Dataset\batter stats in venues.csv"
-    bowler_file = r"D:\Cricket Project\Dataset\bowler stats in venues.csv"
+    batter_file = stats_store.BATTER_FILE
+    bowler_file = stats_store.BOWLER_FILE
 
     if not os.path.exists(batter_file) or not os.path.exists(bowler_file):
         print("Error: One or more dataset files are missing. Ensure the files are in the correct directory.")
         return None, None
 
     try:
-        batter_stats = pd.read_csv(batter_file)
-        bowler_stats = pd.read_csv(bowler_file)
+        with instrumentation.stage('team_selector.load_data'):
+            store = stats_store.get_store(batter_file, bowler_file)
+        batter_stats, bowler_stats = store.batters, store.bowlers
 
         required_columns = {'Player', 'Venue', 'Country'}
         for df, name in zip([batter_stats, bowler_stats], ['batter_stats', 'bowler_stats']):
@@ -34,8 +39,9 @@ def filter_players(batter_stats, bowler_stats, squad, venue):
     if batter_stats is None or bowler_stats is None:
         return [], []
     
-    batters = batter_stats[(batter_stats['Player'].isin(squad)) & (batter_stats['Venue'] == venue)]
-    bowlers = bowler_stats[(bowler_stats['Player'].isin(squad)) & (bowler_stats['Venue'] == venue)]
+    with instrumentation.stage('team_selector.filter_players'):
+        batters = stats_store.select(batter_stats, squad, venue)
+        bowlers = stats_store.select(bowler_stats, squad, venue)
     
     return batters, bowlers
 
@@ -76,52 +82,26 @@ def generate_team(batters, bowlers):
 
 
 # Genetic Algorithm to find the best team
-def genetic_algorithm(batters, bowlers, generations=50, population_size=20):
-    population = []
-
-    for _ in range(population_size):
-        team = generate_team(batters, bowlers)
-        if team:
-            population.append(team)
-
-    if not population:
-        return []
-
-    for _ in range(generations):
-        population = sorted(population, key=lambda team: random.random(), reverse=True)
-        population = population[:10]
-        new_population = population.copy()
-
-        while len(new_population) < population_size:
-            parent1, parent2 = random.sample(population, 2)
-            child = parent1[:7] + parent2[7:]
-            child = list(set(child))  # Remove duplicates
-
-            # Ensure max 4 foreign players
-            foreign_players = [p for p in child if p in batters[batters['Country'] != 'India']['Player'].tolist() or 
-                               p in bowlers[bowlers['Country'] != 'India']['Player'].tolist()]
-            domestic_players = [p for p in child if p in batters[batters['Country'] == 'India']['Player'].tolist() or 
-                                p in bowlers[bowlers['Country'] == 'India']['Player'].tolist()]
-
-            if len(foreign_players) > 4:
-                random.shuffle(foreign_players)
-                foreign_players = foreign_players[:4]  # Trim extra foreign players
-
-            remaining_slots = 12 - len(foreign_players)
-            domestic_players = domestic_players[:remaining_slots]  # Fill with domestic players
-
-            child = foreign_players + domestic_players
-
-            while len(child) < 12:
-                remaining_players = list(set(batters['Player']).union(set(bowlers['Player'])) - set(child))
-                if remaining_players:
-                    child.append(random.choice(remaining_players))
-
-            new_population.append(child)
-
-        population = new_population
-
-    return population[0] if population else []
+def genetic_algorithm(batters, bowlers, generations=50, population_size=20, seed=42,
+                      selection='tournament', patience=None, fitness_terms=(),
+                      opposition=None, opposition_weight=1.0, fitness_cache=True):
+    """Evolve a playing XII with the vectorized engine; returns 12 player names or [].
+
+    fitness_terms are extra batched fitness callables (e.g. matchups.MatchupFitness)
+    built against ga_engine.encode_squad(batters, bowlers). With `opposition`
+    (the opposing bowlers' names, or {bowling_type: weight}) batters who are
+    often dismissed by that attack's bowling types are penalized.
+    """
+    with instrumentation.stage('team_selector.genetic_algorithm'):
+        with instrumentation.stage('encode'):
+            index = ga_engine.encode_squad(batters, bowlers)
+            fitness_terms = list(fitness_terms)
+            if opposition:
+                fitness_terms.append(vulnerability.OpponentFitness(index, opposition, opposition_weight))
+        best = ga_engine.evolve(index, generations, population_size, rng=np.random.default_rng(seed),
+                                selection=selection, patience=patience, fitness_terms=fitness_terms,
+                                fitness_cache=fitness_cache)
+    return index.team_names(best) if best is not None else []
 
 
 # Main function
@@ -0,0 +1,37 @@
+import pandas as pd
+
+import ts
+
+
+def frame(players):
+    return pd.DataFrame({'Player': players})
+
+
+def test_generate_team_leaves_four_bowlers_when_all_rounders_top_the_batting():
+    # Seven all-rounders rank highest with the bat; only three other players bowl
+    all_rounders = [f'All-rounder {i}' for i in range(7)]
+    batters = frame(all_rounders + [f'Batter {i}' for i in range(4)])
+    bowlers = frame([f'Bowler {i}' for i in range(3)] + all_rounders)
+
+    team = ts.generate_team(batters, bowlers)
+
+    assert len(team) == 12 and len(set(team)) == 12
+    assert team[:7] == all_rounders[:6] + ['Batter 0']
+    assert team[7:11] == ['Bowler 0', 'Bowler 1', 'Bowler 2', 'All-rounder 6']
+    assert team[11] == 'Batter 1'
+
+
+def test_generate_team_keeps_top_batters_when_bowlers_suffice():
+    batters = frame([f'Batter {i}' for i in range(8)])
+    bowlers = frame([f'Bowler {i}' for i in range(5)])
+
+    team = ts.generate_team(batters, bowlers)
+
+    assert team == [f'Batter {i}' for i in range(7)] + [f'Bowler {i}' for i in range(4)] + ['Batter 7']
+
+
+def test_generate_team_without_enough_bowlers():
+    batters = frame([f'Player {i}' for i in range(9)])
+    bowlers = frame([f'Player {i}' for i in range(3)])
+
+    assert ts.generate_team(batters, bowlers) == []
@@ -1,115 +1,129 @@
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import LabelEncoder
-
-# Load your original dataset
-df = pd.read_csv("cleaned_player_stats_in_venues_filled.csv")
+import argparse
 
-# Drop missing performance or average values
-df = df.dropna(subset=['Performance_bat', 'batting_average'])
-
-# Save player and venue info for later
-player_names = df['Player_bat']
-venue_names = df['Venue']
-
-# One-hot encode categorical columns
-df_encoded = pd.get_dummies(df, columns=['Country_bat', 'Venue'], drop_first=True)
-
-# Encode target (Performance_bat)
-label_encoder = LabelEncoder()
-df_encoded['Performance_bat_encoded'] = label_encoder.fit_transform(df_encoded['Performance_bat'])
-
-# Drop irrelevant/bowling columns and Player name (not used in model)
-X = df_encoded.drop(columns=[
-    'p_id', 'Player_bat', 'Performance_bat',
-    'matches_played_bowl', 'total_runs_conceded',
-    'balls_bowled', 'economy', 'total_wickets',
-    'Bowling_Strike_Rate', 'Performance_bowl'
-])
-y = df_encoded['Performance_bat_encoded']
-
-# Train model
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-model = RandomForestClassifier(random_state=42)
-model.fit(X_train, y_train)
-
-# Predict for entire dataset
-y_pred = model.predict(X)
-predicted_labels = label_encoder.inverse_transform(y_pred)
-
-# Combine with player and venue names
-results = pd.DataFrame({
-    "Player": player_names,
-    "Venue": venue_names,
-    "Predicted Performance": predicted_labels
-})
-
-# Save to CSV
-results.to_csv("player_venue_predicted_performance.csv", index=False)
-print("Saved to player_venue_predicted_performance.csv")
-
-from sklearn.metrics import accuracy_score
-
-y_test_pred = model.predict(X_test)
-accuracy = accuracy_score(y_test, y_test_pred)
-print("Test Accuracy:", accuracy)
-
-from sklearn.metrics import classification_report
-
-print(classification_report(y_test, y_test_pred, target_names=label_encoder.classes_))
-
-import matplotlib.pyplot as plt
-
-# Get feature importances
-importances = model.feature_importances_
-feature_names = X.columns
-
-# Create a bar chart
-plt.figure(figsize=(10, 6))
-plt.barh(feature_names, importances)
-plt.xlabel("Importance")
-plt.title("Feature Importances")
-plt.tight_layout()
-plt.show()
-
-import matplotlib.pyplot as plt
-
-# Get feature importances
-importances = model.feature_importances_
-feature_names = X.columns
-
-# Sort by importance
-indices = importances.argsort()[::-1]
-sorted_features = feature_names[indices]
-sorted_importances = importances[indices]
-
-# Plot
-plt.figure(figsize=(10, 6))
-plt.barh(sorted_features, sorted_importances)
-plt.xlabel("Feature Importance")
-plt.title("Which Features Affect Player Batting Performance Prediction?")
-plt.gca().invert_yaxis()
-plt.tight_layout()
-plt.show()
-
-
-import matplotlib.pyplot as plt
-
-# Get feature importances from the trained model
-importances = model.feature_importances_
-feature_names = X.columns
-
-# Sort features by importance
-indices = importances.argsort()[::-1]
-sorted_features = feature_names[indices]
-sorted_importances = importances[indices]
-
-# Plot
-plt.figure(figsize=(10, 6))
-plt.barh(sorted_features, sorted_importances)
-plt.xlabel("Feature Importance")
-plt.title("Which Features Affect Player Batting Performance Prediction?")
-plt.gca().invert_yaxis()  # So most important is at the top
-plt.tight_layout()
-plt.show()
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, classification_report
+
+import data_schema
+import performance_model
+
+PREDICTIONS_FILE = 'player_venue_predicted_performance.csv'
+
+
+def plot_feature_importances(model, feature_names):
+    import matplotlib.pyplot as plt
+
+    # Get feature importances
+    importances = model.feature_importances_
+
+    # Create a bar chart
+    plt.figure(figsize=(10, 6))
+    plt.barh(feature_names, importances)
+    plt.xlabel("Importance")
+    plt.title("Feature Importances")
+    plt.tight_layout()
+    plt.show()
+
+    # Sort by importance
+    indices = importances.argsort()[::-1]
+    sorted_features = feature_names[indices]
+    sorted_importances = importances[indices]
+
+    # Plot
+    plt.figure(figsize=(10, 6))
+    plt.barh(sorted_features, sorted_importances)
+    plt.xlabel("Feature Importance")
+    plt.title("Which Features Affect Player Batting Performance Prediction?")
+    plt.gca().invert_yaxis()  # So most important is at the top
+    plt.tight_layout()
+    plt.show()
+
+
+def train_joint(args):
+    # Every venue row: batting and bowling targets are each trained on the rows that have them
+    df = data_schema.load(performance_model.DATA_FILE)
+    artifact, predictions = performance_model.train_joint(df, encoding=args.encoding, n_jobs=args.n_jobs)
+
+    performance_model.save(artifact, args.model)
+    predictions.to_csv(args.predictions, index=False)
+    print(f"Model saved to {args.model}")
+    print(f"Saved to {args.predictions}")
+
+    stats = artifact['stats']
+    print(f"Fit time: {stats['fit_seconds']:.3f} s on {stats['rows']} rows")
+    for name, accuracy in stats['accuracy'].items():
+        print(f"Test Accuracy ({name}):", accuracy)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the batting-performance model.")
+    parser.add_argument('--model', help="Where to save the trained model (default: "
+                        f"{performance_model.MODEL_FILE}, or {performance_model.JOINT_MODEL_FILE} with --joint)")
+    parser.add_argument('--predictions', help="Where to save the prediction table (default: "
+                        f"{PREDICTIONS_FILE}, or {performance_model.JOINT_PREDICTIONS_FILE} with --joint)")
+    parser.add_argument('--plot', action='store_true', help="Show feature-importance charts")
+    parser.add_argument('--encoding', choices=performance_model.ENCODINGS, default='onehot',
+                        help="Categorical encoding: dense one-hot (default), sparse one-hot or ordinal codes")
+    parser.add_argument('--n-jobs', type=int, default=None, help="Cores used to grow trees (-1 for all)")
+    parser.add_argument('--add-trees', type=int, default=0,
+                        help="Warm-start: add this many trees to the saved model instead of retraining")
+    parser.add_argument('--joint', action='store_true',
+                        help="Train batting and bowling models together and write one joint prediction table")
+    args = parser.parse_args()
+    args.model = args.model or (performance_model.JOINT_MODEL_FILE if args.joint else performance_model.MODEL_FILE)
+    args.predictions = args.predictions or (performance_model.JOINT_PREDICTIONS_FILE if args.joint else PREDICTIONS_FILE)
+
+    if args.joint:
+        train_joint(args)
+        return
+
+    # Load your original dataset (cleaned and validated by data_schema), dropping missing performance or averages
+    df = performance_model.load_training_data()
+
+    if args.add_trees:
+        # Grow more trees on the training split of the current data, keeping the saved ones
+        artifact, X, y, X_test, y_test = performance_model.add_trees(joblib.load(args.model), df, args.add_trees,
+                                                                     args.n_jobs)
+    else:
+        # Train model and save it together with its label encoder and column layout
+        artifact, X, y, X_test, y_test = performance_model.train(df, encoding=args.encoding, n_jobs=args.n_jobs)
+    performance_model.save(artifact, args.model)
+    print(f"Model saved to {args.model}")
+
+    stats = artifact['stats']
+    # Process-lifetime peak (loading and encoding included) and how much the fit itself raised it
+    peak_rss = (f"{stats['process_peak_rss_mb']:.1f} MB (fit raised it by {stats['fit_rss_growth_mb']:.1f} MB)"
+                if stats.get('process_peak_rss_mb') is not None else "n/a")
+    print(f"Fit time: {stats['fit_seconds']:.3f} s on {stats['rows']} rows, process peak RSS: {peak_rss}")
+    if stats.get('encode_peak_mb') is not None:
+        print(f"Encoding: {stats['encode_seconds']:.3f} s, peak {stats['encode_peak_mb']:.2f} MB")
+
+    model = artifact['model']
+    label_encoder = artifact['label_encoder']
+
+    # Predict for entire dataset
+    predicted_labels = label_encoder.inverse_transform(model.predict(X))
+
+    # Combine with player and venue names
+    results = pd.DataFrame({
+        "Player": df['Player_bat'],
+        "Venue": df['Venue'],
+        "Predicted Performance": predicted_labels
+    })
+
+    # Save to CSV
+    results.to_csv(args.predictions, index=False)
+    print(f"Saved to {args.predictions}")
+
+    y_test_pred = model.predict(X_test)
+    accuracy = accuracy_score(y_test, y_test_pred)
+    print("Test Accuracy:", accuracy)
+
+    print(classification_report(y_test, y_test_pred, target_names=label_encoder.classes_))
+
+    if args.plot:
+        plot_feature_importances(model, np.array(artifact['layout']['feature_names']))
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,21 @@ import pandas as pd
 import random
 import os
 
+import leaderboards
+import stats_store
+
 # Load data from CSV files
 def load_data():
-    batter_file = r"D:\Cricket Project\Dataset\batter stats in venue.csv"
-    bowler_file = r"D:\Cricket Project\Dataset\bower stats in venue.csv"
+    batter_file = stats_store.BATTER_FILE
+    bowler_file = stats_store.BOWLER_FILE
 
     if not os.path.exists(batter_file) or not os.path.exists(bowler_file):
         print("Error: One or more dataset files are missing. Ensure the files are in the correct directory.")
         return None, None
 
     try:
-        batter_stats = pd.read_csv(batter_file)
-        bowler_stats = pd.read_csv(bowler_file)
+        store = stats_store.get_store(batter_file, bowler_file)
+        batter_stats, bowler_stats = store.batters, store.bowlers
 
         required_columns = {'Player', 'Venue', 'Performance'}
         for df, name in zip([batter_stats, bowler_stats], ['batter_stats', 'bowler_stats']):
@@ -32,10 +35,8 @@ def filter_players(batter_stats, bowler_stats, squad, venue):
     if batter_stats is None or bowler_stats is None:
         return [], []
 
-    batters = batter_stats[(batter_stats['Player'].isin(squad)) & (batter_stats['Venue'] == venue)]
-    bowlers = bowler_stats[(bowler_stats['Player'].isin(squad)) & (bowler_stats['Venue'] == venue)]
-
-    return batters.sort_values(by="Performance", ascending=False), bowlers.sort_values(by="Performance", ascending=False)
+    # Rows come out of the venue leaderboards already ranked best first, so there is nothing to sort here
+    return leaderboards.get(batter_stats, bowler_stats).squad(squad, venue)
 
 # Generate a valid playing XII team with unique players and correct order
 def generate_team(batters, bowlers):
@@ -47,17 +48,30 @@ def generate_team(batters, bowlers):
     if len(batter_list) < 7 or len(bowler_list) < 4:
         return []
 
-    # Select top 7 batters and top 4 bowlers (instead of random sampling)
-    selected_batters = batter_list[:7]
-    selected_bowlers = bowler_list[:4]
+    # Select the top 7 batters, then the top 4 bowlers not already batting (lists are ranked best first).
+    # A batter who also bowls is passed over when taking him would leave fewer than 4 bowlers.
+    bowlers_left = len(bowler_list)
+    bowler_set = set(bowler_list)
+    selected_batters = []
+    for player in batter_list:
+        if len(selected_batters) == 7:
+            break
+        if player in bowler_set:
+            if bowlers_left <= 4:
+                continue
+            bowlers_left -= 1
+        selected_batters.append(player)
+    picked = set(selected_batters)
+    selected_bowlers = [player for player in bowler_list if player not in picked][:4]
 
     # Combine batters first, then bowlers
     final_team = selected_batters + selected_bowlers
+    picked.update(selected_bowlers)
 
-    # Select 12th man (ensuring uniqueness)
-    remaining_players = list(set(batter_list + bowler_list) - set(final_team))
+    # Select 12th man: the next best unpicked player, batters before bowlers
+    remaining_players = [player for player in batter_list + bowler_list if player not in picked]
     if remaining_players:
-        final_team.append(remaining_players[0])  # Pick the next best player
+        final_team.append(remaining_players[0])
 
     return final_team if len(final_team) == 12 else []
 
@@ -2,27 +2,29 @@ import pandas as pd
 import random
 import os
 
+import stats_store
+
 # Load data from CSV files
 def load_data():
-    batter_file = r"D:\Cricket Project\Dataset\batter stats in venues.csv"
-    bowler_file = r"D:\Cricket Project\Dataset\bowler stats in venues.csv"
+    batter_file = stats_store.BATTER_FILE
+    bowler_file = stats_store.BOWLER_FILE
 
     if not os.path.exists(batter_file) or not os.path.exists(bowler_file):
         print("Error: One or more dataset files are missing. Ensure the files are in the correct directory.")
         return None, None
 
     try:
-        batter_stats = pd.read_csv(batter_file)
-        bowler_stats = pd.read_csv(bowler_file)
+        store = stats_store.get_store(batter_file, bowler_file)
+        batter_stats, bowler_stats = store.batters, store.bowlers
 
         required_batter_columns = {'Player', 'Venue', 'Country', 'matches_played', 'total_runs', 'batting_average'}
         required_bowler_columns = {'Player', 'Venue', 'Country', 'matches_played', 'total_runs_conceded', 'balls_bowled', 'economy', 'total_wickets'}
         
-        if not required_batter_columns.issubset(set(map(str.strip, batter_stats.columns))):
+        if not required_batter_columns.issubset(set(batter_stats.columns)):
             print(f"Error: Missing required columns in batter_stats. Expected columns: {required_batter_columns}")
             return None, None
 
-        if not required_bowler_columns.issubset(set(map(str.strip, bowler_stats.columns))):
+        if not required_bowler_columns.issubset(set(bowler_stats.columns)):
             print(f"Error: Missing required columns in bowler_stats. Expected columns: {required_bowler_columns}")
             return None, None
 
@@ -37,8 +39,8 @@ def filter_players(batter_stats, bowler_stats, squad, venue):
     if batter_stats is None or bowler_stats is None:
         return [], []
     
-    batters = batter_stats[(batter_stats['Player'].isin(squad)) & (batter_stats['Venue'] == venue)]
-    bowlers = bowler_stats[(bowler_stats['Player'].isin(squad)) & (bowler_stats['Venue'] == venue)]
+    batters = stats_store.select(batter_stats, squad, venue)
+    bowlers = stats_store.select(bowler_stats, squad, venue)
     
     return batters, bowlers
 
@@ -1,90 +1,118 @@
+import numpy as np
 import pandas as pd
-import random
+
+import ga_engine
+import instrumentation
+import scoring
+import stats_store
+import vulnerability
 
 def load_data(batter_file, bowler_file):
-    batter_stats = pd.read_csv(batter_file)
-    bowler_stats = pd.read_csv(bowler_file)
-    return batter_stats, bowler_stats
+    with instrumentation.stage('ts2.load_data'):
+        store = stats_store.get_store(batter_file, bowler_file)
+    return store.batters, store.bowlers
+
+# One record per filtered player; stats the player has no record for are NaN (as is p_id when the tables carry none)
+PLAYER_DTYPE = np.dtype([
+    ('p_id', np.float64), ('Player', object), ('Country', object), ('Venue', object), ('Performance', object),
+    ('matches_played', np.float64), ('total_runs', np.float64), ('batting_average', np.float64),
+    ('total_runs_conceded', np.float64), ('balls_bowled', np.float64), ('economy', np.float64),
+    ('total_wickets', np.float64), ('Bowling_Strike_Rate', np.float64), ('Predicted Performance', object),
+    ('score', np.float64),
+])
+SHARED_FIELDS = ['p_id', 'Country', 'Venue', 'Performance', 'matches_played', 'Predicted Performance']
+BATTER_FIELDS = ['total_runs', 'batting_average']
+BOWLER_FIELDS = ['total_runs_conceded', 'balls_bowled', 'economy', 'total_wickets', 'Bowling_Strike_Rate']
+
+
+def _fill(table, positions, frame, fields):
+    for field in fields:
+        if field not in frame.columns:
+            continue
+        values = frame[field]
+        if PLAYER_DTYPE[field] != object:
+            values = pd.to_numeric(values, errors='coerce')
+        table[field][positions] = values.to_numpy(dtype=PLAYER_DTYPE[field])
+
+
+def player_table(batters, bowlers):
+    """Combine filtered batter and bowler rows into one PLAYER_DTYPE record per player.
+
+    Players keep their batting record; a bowling record that scores higher
+    is merged in (its shared columns win). Players are numbered batters
+    first, then bowler-only players, in row order.
+    """
+    batters = batters.drop_duplicates('Player', keep='last')
+    # Each bowler's best-scoring record, kept in row order
+    bowler_scores = scoring.player_scores(bowlers)
+    best = np.argsort(-bowler_scores, kind='stable')
+    best = np.sort(best[~bowlers['Player'].iloc[best].duplicated().to_numpy()])
+    bowlers, bowler_scores = bowlers.iloc[best], bowler_scores[best]
+
+    names = pd.Index(pd.unique(np.concatenate([batters['Player'].to_numpy(dtype=object),
+                                               bowlers['Player'].to_numpy(dtype=object)])))
+    table = np.zeros(len(names), dtype=PLAYER_DTYPE)
+    for field in PLAYER_DTYPE.names:
+        table[field] = np.nan if PLAYER_DTYPE[field] != object else None
+    table['Player'] = names.to_numpy(dtype=object)
+
+    batter_pos = names.get_indexer(batters['Player'])
+    _fill(table, batter_pos, batters, SHARED_FIELDS + BATTER_FIELDS)
+    batting_score = np.full(len(names), -np.inf)
+    batting_score[batter_pos] = scoring.player_scores(batters)
+
+    bowler_pos = names.get_indexer(bowlers['Player'])
+    merge = bowler_scores > batting_score[bowler_pos]
+    _fill(table, bowler_pos[merge], bowlers[merge], SHARED_FIELDS + BOWLER_FIELDS)
+    table['score'] = scoring.player_scores(pd.DataFrame({field: table[field] for field in scoring.SCORE_COLUMNS}))
+    return table
+
 
 def filter_by_squad_and_venue(batter_stats, bowler_stats, squad, venue):
-    batters = batter_stats[(batter_stats['Venue'] == venue) & (batter_stats['Player'].isin(squad))].copy()
-    bowlers = bowler_stats[(bowler_stats['Venue'] == venue) & (bowler_stats['Player'].isin(squad))].copy()
-    
-    combined_players = {}
-    for _, row in batters.iterrows():
-        combined_players[row['Player']] = row.to_dict()
-    for _, row in bowlers.iterrows():
-        if row['Player'] in combined_players:
-            if evaluate_player(row.to_dict()) > evaluate_player(combined_players[row['Player']]):
-                combined_players[row['Player']].update(row.to_dict())
-        else:
-            combined_players[row['Player']] = row.to_dict()
-    
-    return list(combined_players.values())
+    with instrumentation.stage('ts2.filter_by_squad_and_venue'):
+        batters = stats_store.select(batter_stats, squad, venue)
+        bowlers = stats_store.select(bowler_stats, squad, venue)
+        return player_table(batters, bowlers)
 
 def evaluate_player(player):
-    return (
-        player.get('total_runs', 0) * 1.5 +
-        player.get('batting_average', 0) * 2 +
-        player.get('total_wickets', 0) * 3 +
-        (100 - player.get('economy', 0)) * 1.5
-    )
+    return player['score'] if isinstance(player, np.void) else scoring.score_record(player)
 
 def fitness(team):
-    return sum(evaluate_player(player) for player in team)
-
-def initialize_population(players, size=10):
-    population = []
-    for _ in range(size):
-        random.shuffle(players)
-        team = players[:12]
-        population.append(team)
-    return population
-
-def select_parents(population):
-    population.sort(key=fitness, reverse=True)
-    return population[:2]
-
-def crossover(parent1, parent2):
-    split = len(parent1) // 2
-    child1 = parent1[:split] + parent2[split:]
-    child2 = parent2[:split] + parent1[split:]
-    return child1, child2
-
-def mutate(team, players):
-    if random.random() < 0.2:
-        replace_idx = random.randint(0, len(team) - 1)
-        potential_replacements = [p for p in players if p not in team]
-        if potential_replacements:
-            team[replace_idx] = random.choice(potential_replacements)
-    return team
-
-def genetic_algorithm(players, generations=20, population_size=10):
-    population = initialize_population(players, population_size)
-    
-    for _ in range(generations):
-        parents = select_parents(population)
-        children = []
-        for _ in range(population_size // 2):
-            child1, child2 = crossover(parents[0], parents[1])
-            children.append(mutate(child1, players))
-            children.append(mutate(child2, players))
-        population = children
-    
-    return select_parents(population)[0]
+    return team['score'].sum()
+
+def genetic_algorithm(players, generations=20, population_size=10, seed=None, selection='tournament', patience=None,
+                      fitness_terms=(), opposition=None, opposition_weight=1.0, fitness_cache=True):
+    with instrumentation.stage('ts2.genetic_algorithm'):
+        with instrumentation.stage('encode'):
+            index = ga_engine.index_from_records(players)
+            fitness_terms = list(fitness_terms)
+            if opposition:
+                # Penalize batters often dismissed by the opposition's bowling types
+                fitness_terms.append(vulnerability.OpponentFitness(index, opposition, opposition_weight))
+        best = ga_engine.evolve(index, generations, population_size, rng=np.random.default_rng(seed),
+                                selection=selection, patience=patience, fitness_terms=fitness_terms,
+                                fitness_cache=fitness_cache)
+    return players[best] if best is not None else players[:0]
+
+# A stat for display; NaN (no record) shows as N/A
+def _stat(player, field):
+    value = player[field]
+    return 'N/A' if isinstance(value, float) and np.isnan(value) else value
 
 def display_selected_team(selected_team):
     print("\nBest Playing XII:")
     for i, player in enumerate(selected_team, 1):
-        print(f"{i}. ID: {player.get('p_id', 'N/A')}, Name: {player['Player']}, Matches: {player['matches_played']}, \
-                Runs Scored: {player.get('total_runs', 'N/A')}, \
-                Batting Avg: {player.get('batting_average', 'N/A')}, Runs Conceded: {player.get('total_runs_conceded', 'N/A')}, \
-                Balls Bowled: {player.get('balls_bowled', 'N/A')}, Economy: {player.get('economy', 'N/A')}, \
-                Wickets: {player.get('total_wickets', 'N/A')}, Performance Score: {evaluate_player(player)}")
+        player_id = _stat(player, 'p_id')
+        player_id = int(player_id) if player_id != 'N/A' else player_id
+        print(f"{i}. ID: {player_id}, Name: {player['Player']}, Matches: {_stat(player, 'matches_played')}, \
+                Runs Scored: {_stat(player, 'total_runs')}, \
+                Batting Avg: {_stat(player, 'batting_average')}, Runs Conceded: {_stat(player, 'total_runs_conceded')}, \
+                Balls Bowled: {_stat(player, 'balls_bowled')}, Economy: {_stat(player, 'economy')}, \
+                Wickets: {_stat(player, 'total_wickets')}, Performance Score: {evaluate_player(player)}")
 
 def main():
-    batter_file = "batter stats in venues.csv"
-    bowler_file = "bowler stats in venues.csv"
+    batter_file = stats_store.BATTER_FILE
+    bowler_file = stats_store.BOWLER_FILE
     
     squad = input("Enter squad players (comma-separated): ").strip().split(',')
     squad = [player.strip() for player in squad]
@@ -0,0 +1,90 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+import data_schema
+import ga_engine
+from stats_store import normalize
+
+DISMISSALS_FILE = 'batter dismissed against perticular bowler type.csv'
+ROSTER_FILE = 'bowler list.xlsx'
+MATCHUP_FILE = 'batter_bowler_analysis.csv'
+
+
+def _clean_type(name):
+    # 'Right  Mid Fast' and 'Right Mid Fast' are the same bowling type
+    return ' '.join(str(name).split())
+
+
+class VulnerabilityProfiles:
+    """Batter x bowling-type dismissal counts plus the bowler roster's types.
+
+    matrix has one row per batter (in batter_names order) and a final zero
+    row for batters without a profile; columns follow bowling_types.
+    """
+
+    def __init__(self, dismissals_file=DISMISSALS_FILE, roster_file=ROSTER_FILE):
+        df = data_schema.load(dismissals_file)
+        counts = df.drop(columns=['batter']).astype(float).fillna(0)
+        counts = counts.T.groupby(counts.columns.map(_clean_type)).sum().T
+
+        self.bowling_types = list(counts.columns)
+        self.batter_names = df['batter'].astype(str).tolist()
+        self._batter_ids = {normalize(name): i for i, name in enumerate(self.batter_names)}
+        self.matrix = np.vstack([counts.to_numpy(), np.zeros(len(self.bowling_types))])
+        self.bowler_types = _load_roster(roster_file)
+
+    def batter_ids(self, names):
+        unknown = len(self.batter_names)
+        return np.array([self._batter_ids.get(normalize(name), unknown) for name in names], dtype=np.int64)
+
+    def attack_weights(self, attack):
+        """Bowling-type vector of an attack: how many of its bowlers bowl each type.
+
+        attack is a list of bowler names (looked up in the roster) or a dict
+        of {bowling_type: weight}. Unknown bowlers are ignored.
+        """
+        weights = np.zeros(len(self.bowling_types))
+        positions = {name: i for i, name in enumerate(self.bowling_types)}
+        if isinstance(attack, dict):
+            items = attack.items()
+        else:
+            items = ((self.bowler_types.get(normalize(bowler)), 1.0) for bowler in attack)
+        for bowling_type, weight in items:
+            if bowling_type is not None and _clean_type(bowling_type) in positions:
+                weights[positions[_clean_type(bowling_type)]] += weight
+        return weights
+
+
+# bowler -> bowling type, from the roster spreadsheet or, without openpyxl, from the matchup data
+def _load_roster(roster_file):
+    try:
+        roster = pd.read_excel(roster_file)
+    except ImportError:
+        roster = data_schema.load(MATCHUP_FILE)[['bowler', 'bowling_type']].drop_duplicates('bowler')
+    return {normalize(bowler): _clean_type(kind) for bowler, kind in zip(roster['bowler'], roster['bowling_type'])}
+
+
+@lru_cache(maxsize=None)
+def get_profiles(dismissals_file=DISMISSALS_FILE, roster_file=ROSTER_FILE):
+    """Process-wide VulnerabilityProfiles, built on first use."""
+    return VulnerabilityProfiles(dismissals_file, roster_file)
+
+
+class OpponentFitness:
+    """GA fitness term penalizing batters who are often dismissed by the opposition's bowling types.
+
+    The squad's penalty vector is one matrix-vector product (vulnerability
+    rows of the squad's batters times the attack's type weights), so each
+    population batch costs a gather-and-sum.
+    """
+
+    def __init__(self, index, attack, weight=1.0, profiles=None):
+        profiles = profiles or get_profiles()
+        rows = profiles.matrix[profiles.batter_ids(index.names)]
+        batters = (index.role & ga_engine.ROLE_BATTER) > 0
+        self.penalty = weight * (rows @ profiles.attack_weights(attack)) * batters
+
+    def __call__(self, population):
+        return -self.penalty[population].sum(axis=1)